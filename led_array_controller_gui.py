@@ -23,14 +23,416 @@ Version: 0.1
 """
 
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+import _tkinter
+from tkinter import ttk, scrolledtext, messagebox, filedialog
 import serial
+import serial.threaded
 import serial.tools.list_ports
 import threading
+import json
+import os
 import time
-import re
-from datetime import datetime
-import queue
+import collections
+import functools
+
+
+# How long a serial port scan stays valid before comports() is called again (seconds)
+PORT_CACHE_TTL = 2.0
+
+# Minimum interval between slider-driven display refreshes while dragging (ms)
+SCALE_DEBOUNCE_MS = 50
+
+# Last-used port and baud rate, restored on the next launch
+SETTINGS_PATH = os.path.join(os.path.expanduser("~"), ".led_array_controller.json")
+
+BAUD_RATES = ["9600", "115200", "230400"]
+
+# Driver input buffer requested on Windows (bytes); the default 4 KB fills during the INIT burst
+SERIAL_RX_BUFFER_SIZE = 65536
+
+# Number of lines kept in the communication log, and how far it may overshoot before trimming
+LOG_MAX_LINES = 1000
+LOG_TRIM_SLACK = 200
+# Width of the "[HH:MM:SS.mmm] " prefix on every formatted log line
+LOG_TIMESTAMP_WIDTH = len("[00:00:00.000] ")
+
+# Sent commands remembered in command_history
+COMMAND_HISTORY_SIZE = 500
+
+# Upper bound on serial messages handled per update_gui tick, keeps the UI responsive under RX bursts
+MAX_QUEUE_DRAIN_PER_TICK = 200
+
+# Messages that only refresh a display; when several arrive in one drain only the last is applied
+LATEST_ONLY_MESSAGES = frozenset(('system_state',))
+
+# Demo status text shown for each known STATE: value while no demo is running
+DEMO_STATUS_FOR_STATE = {
+    "Ready": "Ready for demos",
+    "Initializing": "System initializing...",
+    "Processing": "Processing command...",
+    "Waiting for Chain": "Waiting for chain...",
+}
+
+# Widget states per control mode: kind -> mode -> (device label state, device combo state, send button text)
+MODE_WIDGET_STATES = {
+    "servo": {
+        "all": ("disabled", "disabled", "Send to All Servos"),
+        "individual": ("normal", "readonly", "Send to Selected Servo"),
+    },
+    "dac": {
+        "all": ("disabled", "disabled", "Send to All LEDs"),
+        "individual": ("normal", "readonly", "Send to Selected LED"),
+    },
+}
+
+# EOT-tracked commands written ahead of their completion; 4 commands of at most 16 bytes
+# fit in the Arduino's 64-byte serial receive buffer
+MAX_COMMANDS_IN_FLIGHT = 4
+
+# Tracked commands held back in the GUI before further sends are refused
+MAX_COMMAND_BACKLOG = 16
+
+# How long commands may wait for their next EOT before they are assumed lost (ms)
+EOT_TIMEOUT_MS = 3000
+
+# How long the "still processing" notice stays up after a refused send (ms)
+BUSY_HINT_MS = 1500
+
+# Current limit for the LED arrays (mA) and the raw DAC value text for every allowed current.
+# Raw values map 0-2100mA to 0-1023 (keeping original mapping), so 1500mA = raw value 730
+DAC_MAX_CURRENT_MA = 1500
+DAC_RAW_VALUE = tuple(current_ma * 1023 // 2100 for current_ma in range(DAC_MAX_CURRENT_MA + 1))
+DAC_RAW_TEXT = tuple(str(raw_value) for raw_value in DAC_RAW_VALUE)
+
+# Zero-padded three-digit device IDs as used by the command protocol ("001", "002", ...)
+MAX_DEVICE_ID = 999
+DEVICE_ID_TEXT = tuple(f"{device:03d}" for device in range(MAX_DEVICE_ID + 1))
+
+# Demo step tables: (broadcast command or None to just pause, delay before the next step in ms, log note).
+# Every command is fixed, so the sequences are formatted once here instead of on each demo start.
+# Servo Dance: Servo 60→120→90, DAC 50%→0% (750mA, within the safety limit), repeat 2x
+DANCE_DEMO_STEPS = tuple(
+    step
+    for cycle in range(2)
+    for step in (
+        ("000,servo,60", 800, f"Dance - Cycle {cycle + 1}/2"),
+        ("000,servo,120", 800, None),
+        (f"000,dac,{DAC_RAW_VALUE[750]}", 500, None),
+        ("000,servo,90", 500, None),
+        ("000,dac,0", 800, None),
+    )
+)
+# Servo Wave: 60 to 120 in small steps and back down, 2 cycles
+_SERVO_WAVE_CYCLE = tuple((f"000,servo,{angle}", 300, None)
+                          for angle in (*range(60, 121, 5), *range(120, 59, -5)))
+SERVO_WAVE_DEMO_STEPS = _SERVO_WAVE_CYCLE * 2
+# DAC Rainbow: fade 0mA to 1500mA (safety limit), hold, fade back down, hold, 2 cycles
+_DAC_RAINBOW_CYCLE = (
+    tuple((f"000,dac,{DAC_RAW_VALUE[current_ma]}", 200, None) for current_ma in range(0, 1501, 150))
+    + ((None, 500, None),)
+    + tuple((f"000,dac,{DAC_RAW_VALUE[current_ma]}", 200, None) for current_ma in range(1500, -1, -150))
+    + ((None, 500, None),)
+)
+DAC_RAINBOW_DEMO_STEPS = _DAC_RAINBOW_CYCLE * 2
+
+
+# Help window content
+HELP_TEXT = """
+        SOLAR GUI - Complete User Guide
+        ========================================================
+        
+        🚀 WHAT THIS SYSTEM DOES:
+        
+        This GUI controls a smart chain of SEEEDuino XIAO controllers that can:
+        • Control LED brightness on multiple devices simultaneously or individually
+        • Move servo motors to precise positions (60-120 degrees)  
+        • Communicate through a daisy-chain setup (like Christmas lights, but smarter!)
+        • Automatically detect how many devices are connected
+        • Provide visual feedback when something goes wrong
+        
+        Think of it as a "conductor" for an orchestra of LED arrays and servo motors!
+        
+        📍 HARDWARE SETUP:
+        
+        Pin Connections (on each XIAO board):
+        • A0 = DAC Output → LED Array Control (amplified)
+        • D2 = PWM Output → Servo Motor (5V logic level)
+        • D1 = RX_READY ← Signal from previous device
+        • D3 = TX_READY → Signal to next device
+        • D6 = TX → Data to next device
+        • D7 = RX ← Data from previous device
+        • D10 = User LED (built-in status indicator)
+        
+        Chain Configuration:
+        [Master Device] → [Device 2] → [Device 3] → ... → [Back to Master]
+            (USB)           (12V)        (12V)
+        
+        🎯 DEVICE NUMBERING SYSTEM:
+        
+        • 000 = ALL DEVICES (Broadcast to entire chain)
+        • 001 = Master Device (Connected to computer via USB)
+        • 002, 003, 004... = Slave Devices (Powered externally, in daisy-chain)
+        
+        🎮 GUI CONTROL SECTIONS:
+        
+        1. SERIAL CONNECTION:
+           • Port Selection: Choose your USB COM port
+           • Baud Rate: Set to 115200 (matches Arduino)
+           • Auto-Connect: Automatically connects to the last used (or first available) port
+           • Refresh: Scan for new ports
+        
+        2. SYSTEM STATUS:
+           • Connection Status: Green=Connected, Red=Disconnected
+           • Total Devices: Auto-detected device count in chain
+           • System State: Ready, Initializing, Processing, etc.
+           • Manual Commands: Device Status, Re-initialize, Help
+        
+        3. DEMO PATTERNS:
+           • 🕺 Simple Dance: Servo sweep + DAC flash (2 cycles)
+           • 🌊 Servo Wave: Smooth servo oscillation (2 cycles)
+           • 🌈 DAC Rainbow: Progressive brightness fade (2 cycles)
+           • ⏹️ Stop Demo: Interrupt any running demo
+        
+        4. SERVO CONTROL:
+           • Range: 60-120 degrees (safety limited)
+           • All Servos Mode: Synchronize all devices (Disk Mode)
+           • Individual Mode: Target specific device (001, 002, etc.)
+           • Presets: 60°, 75°, 90°, 105°, 120°
+           • Real-time Slider: Live angle adjustment
+        
+        5. DAC/LED CONTROL:
+           • Range: 0-1500mA (safety limited, converts to 0-730 raw)
+           • All LEDs Mode: Broadcast to entire chain
+           • Individual Mode: Target specific device
+           • Presets: 0mA, 375mA, 750mA, 1125mA, 1500mA
+           • Raw Value Display: Shows actual DAC value sent
+        
+        6. COMMUNICATION LOG:
+           • TX: Commands sent from GUI to Arduino
+           • RX: Responses received from Arduino (filtered)
+           • Timestamps: All communications timestamped
+           • Export/Clear: Save logs or clear display
+        
+        🎯 COMMAND EXAMPLES:
+        
+        Servo Commands (GUI generates these automatically):
+        • All servos to 90°: "000,servo,90"
+        • Device 2 servo to 75°: "002,servo,75"
+        • Device 1 servo to 120°: "001,servo,120"
+        
+        DAC/LED Commands (current in mA, max 1500mA):
+        • All LEDs to 750mA: "000,dac,365" (50% of limit)
+        • Device 3 LED to 1125mA: "003,dac,548" (75% of limit)
+        • Turn off device 1 LEDs: "001,dac,0" (0mA)
+        
+        System Commands:
+        • "status" - Check device count and system state
+        • "reinit" - Restart device chain detection
+        
+        🔧 CONNECTION PROCESS:
+        
+        1. Hardware Setup:
+           • Connect master device to computer via USB
+           • Connect 12V power to all slave devices
+           • Verify daisy-chain wiring is correct
+        
+        2. Software Connection:
+           • Launch GUI (auto-connects to the last used or first available port)
+           • Or manually select COM port and click "Connect"
+           • Wait 5-10 seconds for device initialization
+           • Check "Total Devices" shows correct count
+        
+        3. Test System:
+           • Click "Device Status" to verify all devices
+           • Try a simple servo command (e.g., All Servos to 90°)
+           • Watch for "✓ Command completed successfully"
+        
+        🚨 TROUBLESHOOTING:
+        
+        Visual Indicators on Hardware:
+        • Blue LED Stuck On: Device error - press reset button on PCB
+        • Orange LED Blinking: Normal state indication
+        • User LED Active: When DAC output > 0
+        
+        Common Issues:
+        
+        Device Detection Problems:
+        • Symptom: "Total Devices" shows 0 or wrong count
+        • Solution: Click "Re-initialize" to restart detection
+        • Check: Verify all devices are powered and connected
+        • Verify: Physical daisy-chain connections are correct
+        
+        Command Not Working:
+        • Check: Device count matches your hardware
+        • Verify: Servo angles are within 60-120°
+        • Verify: DAC current is within 0-1500mA (safety limit)
+        • Check: Communication log for error messages
+        • Try: "Device Status" to check system health
+        
+        Chain Communication Failure:
+        • Symptom: Commands timeout or devices don't respond
+        • Solution: Press reset button on any stuck device (blue LED on)
+        • Check: All power connections and daisy-chain wiring
+        • Try: Disconnect/reconnect USB and restart GUI
+        
+        Wrong Device Count:
+        • Symptom: GUI shows wrong number of devices
+        • Solution: Click "Re-initialize" in System Status
+        • Check: Power all devices before connecting USB
+        • Verify: No broken connections in the chain
+        
+        🎯 BEST PRACTICES:
+        
+        1. Startup Sequence:
+           • Power all slave devices with 12V first
+           • Then connect master device USB to computer
+           • Launch GUI and wait for initialization
+        
+        2. Operation:
+           • Always wait for "✓ Command completed successfully"
+           • Use "All" modes for synchronized movements
+           • Use "Individual" modes for precise control
+           • Monitor communication log for issues
+        
+        3. Demos:
+           • Demos run for 2 complete cycles automatically
+           • Use "Stop Demo" to interrupt any demo
+           • Demos sync with current system state
+           • Perfect for testing your complete setup
+        
+        4. Troubleshooting:
+           • Export logs before reporting issues
+           • Check hardware connections first
+           • Use "Re-initialize" for detection problems
+           • Reset devices (button) if LEDs stuck on
+        
+        💡 TECHNICAL SPECIFICATIONS:
+        
+        • Microcontroller: SAMD21 (SEEEDuino XIAO)
+        • Communication: 115200 baud, round-robin protocol
+        • Servo Range: 60-120 degrees (safety limited)
+        • DAC Range: 0-1500mA (safety limited, mapped to 0-730 raw values)
+        • Max Chain Length: Limited by power and timing
+        • Auto-Discovery: Automatic device detection
+        • Error Recovery: Automatic timeout handling
+        
+        For advanced users: The Arduino code includes extensive
+        error checking and self-recovery features. Check the
+        communication log for detailed system messages.
+        
+        """
+
+
+def _parse_count(text):
+    """Parse the integer field of a fixed-format message, or None if it is not numeric"""
+    text = text.strip()
+    return int(text) if text.isdecimal() else None
+
+
+def _parse_int(text):
+    """Parse a number typed by the user or set by a Scale, truncated like IntVar.get(), or None"""
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    # Scale drags write values such as "87.34", and "90.0" may be typed
+    try:
+        return int(float(text))
+    except (ValueError, OverflowError):
+        return None
+
+
+def _device_id_text(device):
+    """Return the zero-padded ID text for a device number"""
+    if 0 <= device <= MAX_DEVICE_ID:
+        return DEVICE_ID_TEXT[device]
+    return f"{device:03d}"
+
+
+@functools.lru_cache(maxsize=256)
+def _encode_command(command):
+    """Encode a command line for the wire; demo and control commands repeat, so results are cached"""
+    return command.encode() + b"\n"
+
+
+def _set_if_changed(var, value):
+    """Set a Tk variable only if its value differs, so repeats don't fire traces and redraws"""
+    if var.get() != value:
+        var.set(value)
+
+
+def _repeat_runs(lines):
+    """Group consecutive log lines with the same text (ignoring timestamps) into [first line, text, count] runs"""
+    runs = []
+    for line in lines:
+        text = line[LOG_TIMESTAMP_WIDTH:]
+        if runs and runs[-1][1] == text:
+            runs[-1][2] += 1
+        else:
+            runs.append([line, text, 1])
+    return runs
+
+
+def _repeat_line(run):
+    """Return the log line shown for a run: its first line, with an (xN) suffix if it repeated"""
+    line, _, count = run
+    if count == 1:
+        return line
+    return f"{line[:-1]} (x{count})\n"
+
+
+def _dac_raw_value(current_ma):
+    """Convert current (mA) to the 10-bit DAC value; 0-2100mA maps to 0-1023"""
+    if 0 <= current_ma <= DAC_MAX_CURRENT_MA:
+        return DAC_RAW_VALUE[current_ma]
+    return current_ma * 1023 // 2100
+
+
+def _dac_raw_text(current_ma):
+    """Return the raw DAC value for current_ma as display text"""
+    if 0 <= current_ma <= DAC_MAX_CURRENT_MA:
+        return DAC_RAW_TEXT[current_ma]
+    return str(_dac_raw_value(current_ma))
+
+
+class SerialLineProtocol(serial.threaded.LineReader):
+    """Frames the serial byte stream into lines and hands them to the GUI parser"""
+    
+    TERMINATOR = b'\n'
+    UNICODE_HANDLING = 'ignore'
+    
+    def __init__(self, gui):
+        super().__init__()
+        self.gui = gui
+        
+    def data_received(self, data):
+        """Dispatch every complete line in the buffer; a trailing partial line waits for more data"""
+        buffer = self.buffer
+        buffer.extend(data)
+        end = buffer.rfind(self.TERMINATOR)
+        if end == -1:
+            return
+            
+        # Decode every complete line from this read in one pass, then compact the buffer once
+        text = buffer[:end].decode(self.ENCODING, self.UNICODE_HANDLING)
+        del buffer[:end + 1]
+        
+        # Hand the GUI everything parsed from this read as a single queue item
+        batch = []
+        for line in text.split('\n'):
+            line = line.strip()
+            if line:
+                self.gui.process_serial_line(line, batch)
+        # Once disconnect has begun the GUI no longer wants serial data, and waking it would
+        # make the reader wait on the main thread that is stopping it
+        if batch and self.gui.connected:
+            self.gui.post_messages(batch)
+            
+    def connection_lost(self, exc):
+        """Report read errors to the GUI instead of raising in the reader thread"""
+        self.transport = None
+        if exc is not None and self.gui.connected:  # Only log if we're supposed to be connected
+            self.gui.post_message('error', f"Read error: {str(exc)}")
 
 
 class LEDArrayControllerGUI:
@@ -40,39 +442,120 @@ class LEDArrayControllerGUI:
         self.root.geometry("1000x700")
         self.root.configure(bg='#f0f0f0')
         
+        # Tk may only be touched from the thread that created it
+        self._main_thread_id = threading.get_ident()
+        
         # Serial connection variables
         self.serial_connection = None
         self.connected = False
         self.available_ports = []
+        self._ports_cache = (0.0, None)  # (monotonic timestamp, tuple of port devices)
+        self._port_scan_running = False
+        self._closing = False  # Set by on_closing; worker threads stop posting to the Tk loop
         self.total_devices = 0
         self.device_status = "Disconnected"
+        self._device_list_cache = {}  # total_devices -> (device ID list, device ID set)
+        self._device_list_shown = None  # List currently loaded into the device dropdowns
         
         # Threading for serial communication
-        self.stop_threads = False
-        self.message_queue = queue.Queue()
-        
-        # Command history
-        self.command_history = []
+        self.reader_thread = None
+        # Single consumer (the Tk thread), so a deque with atomic append/popleft is enough
+        self.message_queue = collections.deque()
+        self._drain_pending = False  # True while a <<SerialRx>> wakeup is in flight
+        self._last_feedback = None  # Last (message_type, value) feedback posted by the reader thread
+        # Arduino message tag (text before the first ':') -> parser, run in the reader thread
+        self._rx_handlers = {
+            "EOT": self._rx_eot,
+            "SRV": self._rx_servo,
+            "DAC": self._rx_dac,
+            "UI": self._rx_ui,
+            "STATE": self._rx_state,
+            "ERR": self._rx_error,
+            "TOTAL": self._rx_total,
+            "INIT": self._rx_init,
+            "VER": self._rx_version,
+        }
+        # GUI message type -> handler, run in the main thread by handle_message
+        self._message_handlers = {
+            'receive': self._on_receive,
+            'device_count': self._on_device_count,
+            'system_state': self._on_system_state,
+            'command_complete': self._on_command_complete,
+            'device_initialized': self._on_device_initialized,
+            'init_complete': self._on_init_complete,
+            'version': self._on_version,
+            'ui_message': self._on_ui_message,
+            'error_message': self._on_error_message,
+            'user_log': self.log_message,
+            'servo_feedback': self._on_servo_feedback,
+            'dac_feedback': self._on_dac_feedback,
+            'error': self.log_message,
+            'ports': self._on_ports,
+            'log': self._buffer_log_line,  # Already timestamped by log_from_thread when it was logged
+        }
+        
+        # Command history (most recent COMMAND_HISTORY_SIZE commands; older ones drop off)
+        self.command_history = collections.deque(maxlen=COMMAND_HISTORY_SIZE)
+        
+        # Outgoing commands queued within one Tk event tick are coalesced into a single write()
+        self._tx_buf = bytearray()
+        self._tx_scheduled = False
+        self._tx_lock = threading.Lock()
+        self._command_prefixes = {}  # (device_id, kind) -> encoded "<device>,<kind>," prefix
         
         # Demo state variables
         self.demo_running = False
-        self.demo_thread = None
-        
-        # Command completion tracking
-        self.waiting_for_eot = False
+        self._demo_steps = []  # (command or None, delay after it in ms, log note or None)
+        self._demo_index = 0
+        self._demo_after_id = None  # Pending root.after() for the next demo step
+        self._demo_deadline = 0.0  # time.monotonic() at which the next demo step is due
+        self._demo_done_message = ""
+        
+        # Communication log: history of formatted lines, trimmed in step with the widget so
+        # an export holds exactly what is shown, plus lines awaiting the next flush
+        self._log_lines = collections.deque(maxlen=LOG_MAX_LINES + LOG_TRIM_SLACK)
+        self._log_pending = []
+        self._log_flush_scheduled = False
+        self._log_line_count = 0  # Newline-terminated lines currently in the log widget
+        self._log_tail = None  # [first line, text, count] run shown as the last log line
+        
+        # Log timestamp caches: (epoch second, "HH:MM:SS") and (epoch millisecond, "[HH:MM:SS.mmm] ")
+        self._ts_clock = (0, "")
+        self._ts_prefix = (0, "")
+        
+        # Command completion tracking: commands written but not yet confirmed by EOT, and
+        # (command, payload) pairs held back until earlier ones complete
+        self._eot_outstanding = 0
+        self._eot_backlog = collections.deque()
+        self._untracked_outstanding = 0  # Plain send_command writes whose EOT has not arrived yet
+        self._eot_after_id = None  # Pending root.after() that gives up on EOTs that never arrive
+        self._hint_after_id = None  # Pending root.after() that clears the busy notice
+        
+        # Slider display updates waiting on their debounce timer
+        self._scale_updates_pending = set()
+        
+        # Last control mode applied to the servo/DAC widgets
+        self._mode_state = {"servo": None, "dac": None}
+        
+        # Help window, created on first use
+        self._help_window = None
         
         # Demo status variable (referenced in update_gui but needs initialization)
         self.demo_status_var = tk.StringVar(value="Ready for demos")
         
         # Create GUI elements
         self.create_widgets()
-        self.update_port_list()
+        self.restore_settings()
+        
+        # Open the port used last session straight away; if that fails, auto-connect falls
+        # back to the first port the scan finds
+        self.root.after(0, self.auto_connect_last_port)
         
-        # Auto-connect to first available port
-        self.root.after(1000, self.auto_connect_first_port)
+        # Scan ports after the window has painted
+        self.root.after(0, self.update_port_list)
         
-        # Start GUI update loop
-        self.update_gui()
+        # Drain the message queue whenever the reader thread signals new data
+        self.root.bind("<<SerialRx>>", self.update_gui)
         
     def create_widgets(self):
         """Create all GUI widgets"""
@@ -131,7 +614,7 @@ class LEDArrayControllerGUI:
         ttk.Label(connection_frame, text="Baud:").grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
         self.baud_var = tk.StringVar(value="115200")
         baud_combo = ttk.Combobox(connection_frame, textvariable=self.baud_var, 
-                                 values=["9600", "115200", "230400"], width=10, state="readonly")
+                                 values=BAUD_RATES, width=10, state="readonly")
         baud_combo.grid(row=1, column=1, sticky=tk.W, padx=(5, 0), pady=(0, 5))
         
         # Connect/Disconnect buttons
@@ -179,6 +662,11 @@ class LEDArrayControllerGUI:
         ttk.Button(manual_frame, text="Help", 
                   command=self.show_help_window).pack(side=tk.LEFT)
         
+        # Non-modal notice shown when a send is refused because the command backlog is full
+        self.status_hint_var = tk.StringVar()
+        ttk.Label(status_frame, textvariable=self.status_hint_var, 
+                 foreground="orange").grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
     def create_demo_section(self, parent, row, col):
         """Create demo pattern controls"""
         demo_frame = ttk.LabelFrame(parent, text="Demo Patterns", padding="10")
@@ -233,10 +721,10 @@ class LEDArrayControllerGUI:
         
         ttk.Radiobutton(mode_frame, text="All Servos (Disk Mode)", 
                        variable=self.servo_mode_var, value="all",
-                       command=self.update_servo_mode).pack(side=tk.LEFT, padx=(10, 0))
+                       command=lambda: self._apply_mode("servo")).pack(side=tk.LEFT, padx=(10, 0))
         ttk.Radiobutton(mode_frame, text="Individual Servo", 
                        variable=self.servo_mode_var, value="individual",
-                       command=self.update_servo_mode).pack(side=tk.LEFT, padx=(10, 0))
+                       command=lambda: self._apply_mode("servo")).pack(side=tk.LEFT, padx=(10, 0))
         
         # Device selection (for individual mode)
         device_frame = ttk.Frame(servo_frame)
@@ -253,10 +741,6 @@ class LEDArrayControllerGUI:
                                           foreground="gray", font=("Arial", 8))
         self.servo_device_info.pack(side=tk.LEFT)
         
-        # Initially disable device selection (all mode is default)
-        self.servo_device_label.configure(state="disabled")
-        self.servo_device_combo.configure(state="disabled")
-        
         # Angle control
         ttk.Label(servo_frame, text="Angle (degrees):").grid(row=2, column=0, sticky=tk.W, pady=(0, 5))
         self.servo_angle_var = tk.IntVar(value=90)
@@ -267,7 +751,8 @@ class LEDArrayControllerGUI:
         # Angle slider  
         self.servo_scale = ttk.Scale(servo_frame, from_=60, to=120, orient=tk.HORIZONTAL,
                                     variable=self.servo_angle_var, length=250,
-                                    command=self.update_servo_display)
+                                    command=lambda value: self._debounce_scale(self.servo_scale,
+                                                                               self.update_servo_display))
         self.servo_scale.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 10))
         
         # Preset buttons
@@ -293,6 +778,9 @@ class LEDArrayControllerGUI:
                                         command=self.send_servo_command)
         self.servo_send_btn.pack(side=tk.LEFT)
         
+        # Initially disable device selection (all mode is default)
+        self._apply_mode("servo")
+        
     def create_dac_section(self, parent, row, col):
         """Create DAC control section with dual modes"""
         dac_frame = ttk.LabelFrame(parent, text="DAC/LED Control", padding="10")
@@ -307,10 +795,10 @@ class LEDArrayControllerGUI:
         
         ttk.Radiobutton(mode_frame, text="All LEDs", 
                        variable=self.dac_mode_var, value="all",
-                       command=self.update_dac_mode).pack(side=tk.LEFT, padx=(10, 0))
+                       command=lambda: self._apply_mode("dac")).pack(side=tk.LEFT, padx=(10, 0))
         ttk.Radiobutton(mode_frame, text="Individual LED", 
                        variable=self.dac_mode_var, value="individual",
-                       command=self.update_dac_mode).pack(side=tk.LEFT, padx=(10, 0))
+                       command=lambda: self._apply_mode("dac")).pack(side=tk.LEFT, padx=(10, 0))
         
         # Device selection (for individual mode)
         device_frame = ttk.Frame(dac_frame)
@@ -327,21 +815,20 @@ class LEDArrayControllerGUI:
                                         foreground="gray", font=("Arial", 8))
         self.dac_device_info.pack(side=tk.LEFT)
         
-        # Initially disable device selection (all mode is default)
-        self.dac_device_label.configure(state="disabled")
-        self.dac_device_combo.configure(state="disabled")
-        
                 # Current control (mA) - Limited to 1500mA for safety
         ttk.Label(dac_frame, text="Current (mA):").grid(row=2, column=0, sticky=tk.W, pady=(0, 5))
         self.dac_current_var = tk.IntVar(value=0)
         dac_current_spin = ttk.Spinbox(dac_frame, from_=0, to=1500, width=10, 
-                                      textvariable=self.dac_current_var)
+                                      textvariable=self.dac_current_var,
+                                      command=self.update_dac_raw_value)
         dac_current_spin.grid(row=2, column=1, sticky=tk.W, padx=(5, 0), pady=(0, 5))
+        dac_current_spin.bind("<KeyRelease>", self.update_dac_raw_value)
         
         # Current slider - Limited to 1500mA
         self.dac_scale = ttk.Scale(dac_frame, from_=0, to=1500, orient=tk.HORIZONTAL,
                                   variable=self.dac_current_var, length=250,
-                                  command=self.update_dac_display)
+                                  command=lambda value: self._debounce_scale(self.dac_scale,
+                                                                             self.update_dac_display))
         self.dac_scale.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 10))
         
         # Raw value display
@@ -349,9 +836,6 @@ class LEDArrayControllerGUI:
         self.dac_raw_var = tk.StringVar(value="0")
         ttk.Label(dac_frame, textvariable=self.dac_raw_var).grid(row=4, column=1, sticky=tk.W, padx=(5, 0), pady=(0, 5))
         
-        # Update raw value when current changes
-        self.dac_current_var.trace('w', self.update_dac_raw_value)
-        
         # Preset buttons
         preset_frame = ttk.Frame(dac_frame)
         preset_frame.grid(row=5, column=0, columnspan=2, pady=(10, 0))
@@ -372,6 +856,9 @@ class LEDArrayControllerGUI:
                                       command=self.send_dac_command)
         self.dac_send_btn.grid(row=6, column=0, columnspan=2, pady=(10, 0))
         
+        # Initially disable device selection (all mode is default)
+        self._apply_mode("dac")
+        
     def create_log_section(self, parent, row, col):
         """Create command log and output section"""
         log_frame = ttk.LabelFrame(parent, text="Communication Log", padding="10")
@@ -393,21 +880,51 @@ class LEDArrayControllerGUI:
                   command=self.export_log).pack(side=tk.LEFT)
         
     def update_port_list(self):
-        """Scan for available serial ports"""
-        try:
-            ports = serial.tools.list_ports.comports()
-            self.available_ports = [port.device for port in ports]
-            self.port_combo['values'] = self.available_ports
+        """Scan for available serial ports in the background (cached for PORT_CACHE_TTL seconds)"""
+        cached_at, cached_ports = self._ports_cache
+        if cached_ports is not None and time.monotonic() - cached_at < PORT_CACHE_TTL:
+            return
+        if self._port_scan_running:
+            return
             
-            if self.available_ports and not self.port_var.get():
-                self.port_var.set(self.available_ports[0])
-                
-            self.log_message(f"Found {len(self.available_ports)} serial ports")
+        # comports() can stall for 50-200 ms on Windows; keep it off the Tk thread
+        self._port_scan_running = True
+        threading.Thread(target=self._scan_ports, daemon=True).start()
+        
+    def _scan_ports(self):
+        """Enumerate serial ports and hand the result to the GUI (runs in a worker thread)"""
+        try:
+            ports = tuple(port.device for port in serial.tools.list_ports.comports(include_links=False))
         except Exception as e:
-            self.log_message(f"Error scanning ports: {str(e)}")
+            self.log_from_thread(f"Error scanning ports: {str(e)}")
+            ports = None
+        self.post_message('ports', ports)
+        
+    def _on_ports(self, ports):
+        """Apply a finished port scan to the port dropdown"""
+        self._port_scan_running = False
+        if ports is None:
+            return
+            
+        cached_ports = self._ports_cache[1]
+        self._ports_cache = (time.monotonic(), ports)
+        
+        # Only touch the combobox when the set of ports actually changed; enumeration
+        # order is not stable between scans on every platform
+        if cached_ports is not None and sorted(ports) == sorted(cached_ports):
+            return
             
-    def connect_serial(self):
-        """Connect to selected serial port"""
+        self.available_ports = list(ports)
+        self.port_combo['values'] = self.available_ports
+        
+        # Don't leave a port that has gone (e.g. the one saved last session) selected
+        if not self.connected and self.port_var.get() not in self.available_ports:
+            self.port_var.set(self.available_ports[0] if self.available_ports else "")
+            
+        self.log_message(f"Found {len(self.available_ports)} serial ports")
+            
+    def connect_serial(self, show_errors=True):
+        """Connect to selected serial port (show_errors=False only logs a failure)"""
         if not self.port_var.get():
             messagebox.showerror("Error", "Please select a port")
             return
@@ -416,8 +933,10 @@ class LEDArrayControllerGUI:
             self.serial_connection = serial.Serial(
                 port=self.port_var.get(),
                 baudrate=int(self.baud_var.get()),
-                timeout=1
+                timeout=0.2
             )
+            self._tune_serial_port()
+            self._reset_eot_tracking()
             
             self.connected = True
             self.connection_status_var.set("Connected")
@@ -429,28 +948,81 @@ class LEDArrayControllerGUI:
             self.refresh_btn.configure(state="disabled")
             
             # Start reading thread
-            self.stop_threads = False
-            self.read_thread = threading.Thread(target=self.read_serial_data, daemon=True)
-            self.read_thread.start()
+            self.reader_thread = serial.threaded.ReaderThread(
+                self.serial_connection, lambda: SerialLineProtocol(self))
+            self.reader_thread.start()
+            self.reader_thread.connect()
             
             self.log_message(f"Connected to {self.port_var.get()} at {self.baud_var.get()} baud")
+            self.save_settings()
             
-            # Request device status
-            time.sleep(2)  # Give Arduino time to initialize
-            self.send_command("status")
+            # Request device status once the Arduino has had time to initialize,
+            # without blocking the Tk event loop in the meantime
+            self.root.after(2000, self._request_initial_status)
             
         except Exception as e:
-            messagebox.showerror("Connection Error", f"Failed to connect: {str(e)}")
+            # Release a port that opened but could not be set up, so the next attempt can open it
+            if self.connected:
+                self.disconnect_serial()
+            elif self.serial_connection is not None and self.serial_connection.is_open:
+                self.serial_connection.close()
+            if show_errors:
+                messagebox.showerror("Connection Error", f"Failed to connect: {str(e)}")
             self.log_message(f"Connection failed: {str(e)}")
             
+    def _stop_reader_thread(self):
+        """Stop the reader thread and wait for it without deadlocking on its Tk wakeup"""
+        reader = self.reader_thread
+        self.reader_thread = None
+        reader.alive = False
+        if hasattr(reader.serial, 'cancel_read'):
+            reader.serial.cancel_read()
+            
+        # A wakeup the reader started before connected was cleared is blocked in event_generate
+        # until this thread runs it; service such calls while joining (FILE_EVENTS leaves user
+        # input and timers queued) instead of blocking in join() until its timeout
+        deadline = time.monotonic() + 2.0
+        while reader.is_alive() and time.monotonic() < deadline:
+            self.root.tk.dooneevent(_tkinter.FILE_EVENTS | _tkinter.DONT_WAIT)
+            reader.join(0.01)
+            
+    def _tune_serial_port(self):
+        """Configure driver-side buffering so received bytes reach the reader thread promptly"""
+        # Windows only: a larger driver input buffer absorbs the INIT burst between reads
+        set_buffer_size = getattr(self.serial_connection, "set_buffer_size", None)
+        if set_buffer_size is not None:
+            set_buffer_size(rx_size=SERIAL_RX_BUFFER_SIZE)
+            
+        # Linux only: USB-serial adapters otherwise hold bytes for up to 16 ms
+        set_low_latency = getattr(self.serial_connection, "set_low_latency_mode", None)
+        if set_low_latency is None:
+            return
+        try:
+            set_low_latency(True)
+        except (OSError, NotImplementedError, ValueError) as e:
+            # Not supported by this driver (e.g. CDC-ACM); reads still block until data arrives
+            self.log_message(f"Low-latency mode unavailable: {e}")
+            
+    def _request_initial_status(self):
+        """Query device status after connecting, unless the port was closed in the meantime"""
+        if self.connected:
+            self.send_command("status")
+            
     def disconnect_serial(self):
         """Disconnect from serial port"""
-        self.stop_threads = True
+        self.connected = False
+        
+        if self.reader_thread:
+            self._stop_reader_thread()
+        
+        # Drop any commands that have not been written yet
+        self._reset_eot_tracking()
+        with self._tx_lock:
+            self._tx_buf.clear()
         
         if self.serial_connection and self.serial_connection.is_open:
             self.serial_connection.close()
             
-        self.connected = False
         self.connection_status_var.set("Disconnected")
         self.connection_label.configure(foreground="red")
         self.device_count_var.set("0")
@@ -464,13 +1036,30 @@ class LEDArrayControllerGUI:
         # Reset device lists
         self.update_device_lists()
         
+        self.save_settings()
         self.log_message("Disconnected from serial port")
         
+    def auto_connect_last_port(self):
+        """Open the port used last session without waiting for a port scan; fall back to the first port found"""
+        saved_port = self.port_var.get()
+        if saved_port and not self.connected:
+            self.log_message(f"Auto-connecting to last used port: {saved_port}")
+            # A missing saved port is expected (device unplugged); log it rather than raise a dialog
+            self.connect_serial(show_errors=False)
+            
+        if not self.connected:
+            self.update_port_list()
+            self.auto_connect_first_port()
+            
     def auto_connect_first_port(self):
-        """Automatically connect to the first available port if not already connected"""
+        """Automatically connect to the first available port once the port scan is done, if not already connected"""
         if self.connected:
             return  # Already connected, skip auto-connect
             
+        if self._port_scan_running:
+            self.root.after(100, self.auto_connect_first_port)  # Wait for the startup port scan
+            return
+            
         if not self.available_ports:
             self.log_message("Auto-connect: No serial ports detected")
             return
@@ -483,212 +1072,292 @@ class LEDArrayControllerGUI:
         except Exception as e:
             self.log_message(f"Auto-connect failed: {str(e)}")
         
-    def read_serial_data(self):
-        """Read data from serial port in separate thread"""
-        while not self.stop_threads and self.connected:
-            try:
-                if self.serial_connection and self.serial_connection.in_waiting:
-                    line = self.serial_connection.readline().decode('utf-8', errors='ignore').strip()
-                    if line:
-                        # Filter out DEBUG messages before any processing
-                        if line.startswith("DEBUG:"):
-                            continue
-                        
-                        # Parse new Arduino protocol messages
-                        if line.startswith("TOTAL:"):
-                            total_match = re.search(r'TOTAL:(\d+)', line)
-                            if total_match:
-                                self.total_devices = int(total_match.group(1))
-                                self.message_queue.put(('device_count', self.total_devices))
-                        
-                        elif line.startswith("STATE:"):
-                            state_match = re.search(r'STATE:(.+)', line)
-                            if state_match:
-                                state_name = state_match.group(1).strip()
-                                self.message_queue.put(('system_state', state_name))
-                                
-                                # Add user-friendly state messages
-                                if state_name == "Chain Wait":
-                                    self.message_queue.put(('user_log', "🔗 Waiting for chain connection"))
-                                elif state_name == "Initializing":
-                                    self.message_queue.put(('user_log', "🚀 Starting device initialization"))
-                        
-                        elif line.startswith("VER:"):
-                            version_match = re.search(r'VER:(.+)', line)
-                            if version_match:
-                                version = version_match.group(1).strip()
-                                self.message_queue.put(('version', version))
-                        
-                        elif line.startswith("INIT:TOTAL:"):
-                            total_match = re.search(r'INIT:TOTAL:(\d+)', line)
-                            if total_match:
-                                self.total_devices = int(total_match.group(1))
-                                self.message_queue.put(('device_count', self.total_devices))
-                                self.message_queue.put(('init_complete', True))
-                        
-                        elif line.startswith("INIT:DEV:"):
-                            dev_match = re.search(r'INIT:DEV:(\d+)', line)
-                            if dev_match:
-                                device_id = int(dev_match.group(1))
-                                self.message_queue.put(('device_initialized', device_id))
-                        
-                        elif line == "EOT":
-                            self.message_queue.put(('command_complete', True))
-                        
-                        elif line.startswith("UI:"):
-                            # User interface messages - strip UI: prefix and show
-                            ui_message = line[3:].strip()
-                            self.message_queue.put(('ui_message', ui_message))
-                        
-                        elif line.startswith("ERR:"):
-                            # Error messages
-                            error_message = line[4:].strip()
-                            self.message_queue.put(('error_message', error_message))
-                        
-                        elif line.startswith("SRV:"):
-                            # Parse servo feedback for value only: SRV:device:angle
-                            srv_match = re.search(r'SRV:(\d+):(\d+)', line)
-                            if srv_match:
-                                angle = int(srv_match.group(2))
-                                self.message_queue.put(('servo_feedback', angle))
-                        
-                        elif line.startswith("DAC:"):
-                            # Parse DAC feedback for value only: DAC:device:value
-                            dac_match = re.search(r'DAC:(\d+):(\d+)', line)
-                            if dac_match:
-                                raw_value = int(dac_match.group(2))
-                                self.message_queue.put(('dac_feedback', raw_value))
-                        
-                        # Only log non-filtered messages to RX log (filter out EOT, VER:, TOTAL:)
-                        if not (line.startswith("VER:") or line.startswith("TOTAL:") or 
-                        line.startswith("INIT:TOTAL:") or line.startswith("SRV:") or line.startswith("DAC:")
-                        or line.startswith("STATE:")):
-                            self.message_queue.put(('receive', line))
-                                
-                time.sleep(0.1)
-            except Exception as e:
-                if self.connected:  # Only log if we're supposed to be connected
-                    self.message_queue.put(('error', f"Read error: {str(e)}"))
-                break
+    def restore_settings(self):
+        """Preselect the port and baud rate saved by the previous session"""
+        try:
+            with open(SETTINGS_PATH, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+        except (OSError, ValueError):
+            return  # No saved settings yet (or unreadable) - keep defaults
+            
+        if not isinstance(settings, dict):
+            return
+        if settings.get("port"):
+            self.port_var.set(settings["port"])
+        if settings.get("baud") in BAUD_RATES:
+            self.baud_var.set(settings["baud"])
+            
+    def save_settings(self):
+        """Remember the current port and baud rate for the next session"""
+        try:
+            with open(SETTINGS_PATH, 'w', encoding='utf-8') as f:
+                json.dump({"port": self.port_var.get(), "baud": self.baud_var.get()}, f)
+        except OSError as e:
+            self.log_message(f"Could not save settings: {str(e)}")
+            
+    def process_serial_line(self, line, batch):
+        """Parse one line from the Arduino into GUI messages appended to batch (runs in the reader thread)"""
+        # Filter out DEBUG messages before any processing
+        if line.startswith("DEBUG:"):
+            return
+        
+        # Dispatch on the message tag; handlers return True when their parsed message
+        # replaces the raw line in the RX log
+        tag, _, payload = line.partition(":")
+        handler = self._rx_handlers.get(tag)
+        if handler is None or not handler(payload, batch.append):
+            batch.append(('receive', line))
+            
+    def _rx_eot(self, payload, post):
+        """EOT: command complete"""
+        post(('command_complete', True))
+        return False
+        
+    def _rx_servo(self, payload, post):
+        """SRV:device:angle - servo feedback, value only"""
+        device, _, angle = payload.partition(":")
+        if not (device.isdecimal() and angle.isdecimal()):
+            return False
+        self._post_feedback(post, 'servo_feedback', int(angle))
+        return True
+        
+    def _rx_dac(self, payload, post):
+        """DAC:device:value - DAC feedback, raw value only"""
+        device, _, raw_value = payload.partition(":")
+        if not (device.isdecimal() and raw_value.isdecimal()):
+            return False
+        self._post_feedback(post, 'dac_feedback', int(raw_value))
+        return True
+        
+    def _post_feedback(self, post, message_type, value):
+        """Post servo/DAC feedback unless it repeats the last feedback since the previous command"""
+        # Commands to all devices are echoed once per device with the same value
+        feedback = (message_type, value)
+        if feedback != self._last_feedback:
+            self._last_feedback = feedback
+            post(feedback)
+        
+    def _rx_ui(self, payload, post):
+        """UI:message - user interface messages, shown without the prefix"""
+        post(('ui_message', payload.strip()))
+        return False
+        
+    def _rx_state(self, payload, post):
+        """STATE:name - system state change"""
+        state_name = payload.strip()
+        if not state_name:
+            return False
+        post(('system_state', state_name))
+        
+        # Add user-friendly state messages
+        if state_name == "Chain Wait":
+            post(('user_log', "🔗 Waiting for chain connection"))
+        elif state_name == "Initializing":
+            post(('user_log', "🚀 Starting device initialization"))
+        return True
+        
+    def _rx_error(self, payload, post):
+        """ERR:message - error messages"""
+        post(('error_message', payload.strip()))
+        return False
+        
+    def _rx_total(self, payload, post):
+        """TOTAL:count - number of devices in the chain"""
+        total = _parse_count(payload)
+        if total is None:
+            return False
+        self.total_devices = total
+        post(('device_count', self.total_devices))
+        return True
+        
+    def _rx_init(self, payload, post):
+        """INIT:TOTAL:count ends initialization, INIT:DEV:id reports each device"""
+        key, _, value = payload.partition(":")
+        count = _parse_count(value)
+        if count is None:
+            return False
+        if key == "TOTAL":
+            self.total_devices = count
+            post(('device_count', self.total_devices))
+            post(('init_complete', True))
+            return True
+        if key == "DEV":
+            post(('device_initialized', count))
+        return False
+        
+    def _rx_version(self, payload, post):
+        """VER:version - firmware version"""
+        version = payload.strip()
+        if not version:
+            return False
+        post(('version', version))
+        return True
                 
-    def update_gui(self):
+    def post_message(self, message_type, data):
+        """Queue a message for the GUI and wake the Tk loop to process it (thread-safe)"""
+        self.post_messages([(message_type, data)])
+        
+    def post_messages(self, batch):
+        """Queue a list of (message_type, data) messages as one item and wake the Tk loop (thread-safe)"""
+        if self._closing:
+            return
+        self.message_queue.append(batch)
+        if not self._drain_pending:
+            self._drain_pending = True
+            try:
+                self.root.event_generate("<<SerialRx>>", when="tail")
+            except (tk.TclError, RuntimeError):
+                pass  # The window was destroyed after the _closing check; nothing is left to update
+            
+    def update_gui(self, event=None):
         """Update GUI with messages from serial thread"""
+        self._drain_pending = False
+        
+        drained = 0
+        latest = {}
         try:
-            while True:
-                message_type, data = self.message_queue.get_nowait()
+            while drained < MAX_QUEUE_DRAIN_PER_TICK:
+                batch = self.message_queue.popleft()
+                drained += len(batch)
                 
-                if message_type == 'receive':
-                    self.log_message(f"RX: {data}")
-                elif message_type == 'device_count':
-                    self.device_count_var.set(str(data))
-                    self.update_device_lists()
-                    self.log_message(f"Device count updated: {data} devices detected")
-                elif message_type == 'system_state':
-                    self.system_state_var.set(data)
-                    # Sync demo status with system state (if not running a demo)
-                    if not self.demo_running:
-                        if data == "Ready":
-                            self.demo_status_var.set("Ready for demos")
-                        elif data == "Initializing":
-                            self.demo_status_var.set("System initializing...")
-                        elif data == "Processing":
-                            self.demo_status_var.set("Processing command...")
-                        elif data == "Waiting for Chain":
-                            self.demo_status_var.set("Waiting for chain...")
-                        else:
-                            self.demo_status_var.set(f"System: {data}")
-                elif message_type == 'command_complete':
-                    if self.waiting_for_eot:
-                        self.waiting_for_eot = False
-                        self.log_message("✓ Command completed successfully")
-                elif message_type == 'device_initialized':
-                    self.log_message(f"Device {data:03d} initialized")
-                elif message_type == 'init_complete':
-                    self.log_message("Device initialization complete")
-                elif message_type == 'version':
-                    self.log_message(f"Arduino Version: {data}")
-                elif message_type == 'ui_message':
-                    self.log_message(f"ℹ️ {data}")
-                elif message_type == 'error_message':
-                    self.log_message(f"❌ Error: {data}")
-                elif message_type == 'user_log':
-                    self.log_message(data)
-                elif message_type == 'servo_feedback':
-                    angle = data
-                    if self.servo_mode_var.get() == "all":
-                        self.log_message(f"🎯 All servos set to {angle}°")
-                    else:
-                        device_id = self.servo_device_var.get()
-                        self.log_message(f"🎯 Servo on device {device_id} set to {angle}°")
-                elif message_type == 'dac_feedback':
-                    raw_value = data
-                    current_ma = int((raw_value / 1023.0) * 2100)
-                    if self.dac_mode_var.get() == "all":
-                        self.log_message(f"💡 All DACs set to {current_ma}mA (raw: {raw_value})")
+                for message_type, data in batch:
+                    if message_type in LATEST_ONLY_MESSAGES:
+                        latest[message_type] = data
                     else:
-                        device_id = self.dac_device_var.get()
-                        self.log_message(f"💡 DAC on device {device_id} set to {current_ma}mA (raw: {raw_value})")
-                elif message_type == 'error':
-                    self.log_message(data)
+                        self.handle_message(message_type, data)
                     
-        except queue.Empty:
+        except IndexError:
             pass
             
-        # Schedule next update
-        self.root.after(100, self.update_gui)
-        
-    def update_device_lists(self):
-        """Update device selection dropdowns"""
-        individual_devices = []  # Individual devices for servo and DAC individual mode
-        
-        if self.total_devices > 0:
-            individual_devices = [f"{i:03d}" for i in range(1, self.total_devices + 1)]
+        # Display-only updates superseded within this drain are applied once, with the last value
+        for message_type, data in latest.items():
+            self.handle_message(message_type, data)
             
-        # Update servo device dropdown (individual devices only)
-        if individual_devices:
-            self.servo_device_combo['values'] = individual_devices
-            if self.servo_device_var.get() not in individual_devices:
-                self.servo_device_var.set(individual_devices[0])
-        else:
-            self.servo_device_combo['values'] = ["001"]
-            self.servo_device_var.set("001")
+        # Continue once pending events are handled if the drain cap left messages queued
+        if drained >= MAX_QUEUE_DRAIN_PER_TICK:
+            self._drain_pending = True
+            self.root.after_idle(self.update_gui)
+        
+    def handle_message(self, message_type, data):
+        """Apply one message from the serial thread to the GUI (must be called from main thread)"""
+        handler = self._message_handlers.get(message_type)
+        if handler is not None:
+            handler(data)
+            
+    def _on_receive(self, data):
+        """Log a raw RX line"""
+        self.log_message(f"RX: {data}")
         
-        # Update DAC device dropdown (individual devices only)
-        if individual_devices:
-            self.dac_device_combo['values'] = individual_devices
-            if self.dac_device_var.get() not in individual_devices:
-                self.dac_device_var.set(individual_devices[0])
+    def _on_device_count(self, data):
+        """Show the new device count and refresh the device dropdowns"""
+        _set_if_changed(self.device_count_var, str(data))
+        self.update_device_lists()
+        self.log_message(f"Device count updated: {data} devices detected")
+        
+    def _on_system_state(self, data):
+        """Show the system state and mirror it in the demo status"""
+        # STATE: is often repeated unchanged; only changed values reach the labels
+        _set_if_changed(self.system_state_var, data)
+        # Sync demo status with system state (if not running a demo)
+        if not self.demo_running:
+            demo_status = DEMO_STATUS_FOR_STATE.get(data)
+            _set_if_changed(self.demo_status_var, demo_status or f"System: {data}")
+                
+    def _on_command_complete(self, data):
+        """Retire the oldest command awaiting EOT and send the held-back ones that now fit"""
+        if self._untracked_outstanding:
+            # Credit untracked sends (demo step, status, reinit) first, so a tracked command is
+            # never reported complete early; either way one slot at the firmware is free again
+            self._untracked_outstanding -= 1
+        elif self._eot_outstanding:
+            self._eot_outstanding -= 1
+            self.log_message("✓ Command completed successfully")
         else:
-            self.dac_device_combo['values'] = ["001"]
-            self.dac_device_var.set("001")
+            return
             
-
-                
-    def update_servo_mode(self):
-        """Update servo control mode and UI elements"""
+        # Progress: give the commands still outstanding a fresh EOT_TIMEOUT_MS
+        self._cancel_eot_timeout()
+        self._send_backlog()
+        if self._eot_outstanding or self._untracked_outstanding:
+            self._arm_eot_timeout()
+            
+    def _on_device_initialized(self, data):
+        """Log one device finishing initialization"""
+        self.log_message(f"Device {_device_id_text(data)} initialized")
+        
+    def _on_init_complete(self, data):
+        """Log the end of chain initialization"""
+        self.log_message("Device initialization complete")
+        
+    def _on_version(self, data):
+        """Log the firmware version"""
+        self.log_message(f"Arduino Version: {data}")
+        
+    def _on_ui_message(self, data):
+        """Log a firmware UI message"""
+        self.log_message(f"ℹ️ {data}")
+        
+    def _on_error_message(self, data):
+        """Log a firmware error"""
+        self.log_message(f"❌ Error: {data}")
+        
+    def _on_servo_feedback(self, angle):
+        """Log the servo angle the firmware applied"""
         if self.servo_mode_var.get() == "all":
-            # Disable device selection for all mode
-            self.servo_device_label.configure(state="disabled")
-            self.servo_device_combo.configure(state="disabled")
-            self.servo_send_btn.configure(text="Send to All Servos")
+            self.log_message(f"🎯 All servos set to {angle}°")
         else:
-            # Enable device selection for individual mode
-            self.servo_device_label.configure(state="normal")
-            self.servo_device_combo.configure(state="readonly")
-            self.servo_send_btn.configure(text="Send to Selected Servo")
+            device_id = self.servo_device_var.get()
+            self.log_message(f"🎯 Servo on device {device_id} set to {angle}°")
             
-    def update_dac_mode(self):
-        """Update DAC control mode and UI elements"""
+    def _on_dac_feedback(self, raw_value):
+        """Log the DAC current the firmware applied"""
+        current_ma = raw_value * 2100 // 1023
         if self.dac_mode_var.get() == "all":
-            # Disable device selection for all mode
-            self.dac_device_label.configure(state="disabled")
-            self.dac_device_combo.configure(state="disabled")
-            self.dac_send_btn.configure(text="Send to All LEDs")
+            self.log_message(f"💡 All DACs set to {current_ma}mA (raw: {raw_value})")
         else:
-            # Enable device selection for individual mode
-            self.dac_device_label.configure(state="normal")
-            self.dac_device_combo.configure(state="readonly")
-            self.dac_send_btn.configure(text="Send to Selected LED")
+            device_id = self.dac_device_var.get()
+            self.log_message(f"💡 DAC on device {device_id} set to {current_ma}mA (raw: {raw_value})")
+        
+    def update_device_lists(self):
+        """Update device selection dropdowns"""
+        # Individual devices for servo and DAC individual mode, memoized per device count
+        cached = self._device_list_cache.get(self.total_devices)
+        if cached is None:
+            if self.total_devices > 0:
+                individual_devices = list(DEVICE_ID_TEXT[1:self.total_devices + 1])
+            else:
+                individual_devices = ["001"]
+            # Ordered list for the dropdowns, set for membership checks
+            cached = (individual_devices, frozenset(individual_devices))
+            self._device_list_cache[self.total_devices] = cached
+        individual_devices, individual_devices_set = cached
+            
+        # Repeated device_count messages for a stable chain leave the dropdowns untouched
+        if individual_devices is self._device_list_shown:
+            return
+        self._device_list_shown = individual_devices
+            
+        # Update servo device dropdown (individual devices only)
+        self.servo_device_combo['values'] = individual_devices
+        if self.servo_device_var.get() not in individual_devices_set:
+            self.servo_device_var.set(individual_devices[0])
+        
+        # Update DAC device dropdown (individual devices only)
+        self.dac_device_combo['values'] = individual_devices
+        if self.dac_device_var.get() not in individual_devices_set:
+            self.dac_device_var.set(individual_devices[0])
+            
+    def _apply_mode(self, kind):
+        """Update servo or DAC control mode UI elements, skipping re-clicks on the active mode"""
+        mode = getattr(self, f"{kind}_mode_var").get()
+        if self._mode_state[kind] == mode:
+            return
+        self._mode_state[kind] = mode
+        
+        label_state, combo_state, button_text = MODE_WIDGET_STATES[kind][mode]
+        getattr(self, f"{kind}_device_label").configure(state=label_state)
+        getattr(self, f"{kind}_device_combo").configure(state=combo_state)
+        getattr(self, f"{kind}_send_btn").configure(text=button_text)
                 
     def send_command(self, command):
         """Send command to Arduino"""
@@ -697,7 +1366,9 @@ class LEDArrayControllerGUI:
             return False
             
         try:
-            self.serial_connection.write(f"{command}\n".encode())
+            self._queue_tx(_encode_command(command))
+            self._untracked_outstanding += 1
+            self._arm_eot_timeout()
             self.log_message(f"TX: {command}")
             self.command_history.append(command)
             return True
@@ -705,134 +1376,182 @@ class LEDArrayControllerGUI:
             self.log_message(f"Send error: {str(e)}")
             return False
             
-    def send_servo_command(self):
-        """Send servo control command based on selected mode with timeout recovery"""
-        if self.waiting_for_eot:
-            messagebox.showwarning("Wait", "Please wait for previous command to complete")
+    def _queue_tx(self, payload):
+        """Buffer an encoded command; all commands buffered before the next idle tick go out in one write"""
+        self._last_feedback = None  # Log the feedback to this command even if it repeats the last one
+        with self._tx_lock:
+            self._tx_buf += payload
+            if self._tx_scheduled:
+                return
+            self._tx_scheduled = True
+        self.root.after_idle(self._flush_tx)
+        
+    def _flush_tx(self):
+        """Write the buffered commands to the serial port (must be called from main thread)"""
+        with self._tx_lock:
+            payload = bytes(self._tx_buf)
+            self._tx_buf.clear()
+            self._tx_scheduled = False
+            
+        if not payload or not self.connected or not self.serial_connection:
             return
             
-        angle = self.servo_angle_var.get()
-        
         try:
-            angle_int = int(angle)
-            if 60 <= angle_int <= 120:
-                if self.servo_mode_var.get() == "all":
-                    # Send to all devices (disk mode)
-                    device_id = "000"
-                    command = f"{device_id},servo,{angle_int}"
-                    if self.send_command_with_eot_tracking(command):
-                        self.log_message(f"Servo command sent to ALL devices: Angle {angle_int}° (Disk Mode)")
-                else:
-                    # Send to individual device
-                    device_id = self.servo_device_var.get()
-                    command = f"{device_id},servo,{angle_int}"
-                    if self.send_command_with_eot_tracking(command):
-                        self.log_message(f"Servo command sent to Device {device_id}: Angle {angle_int}°")
-            else:
-                messagebox.showerror("Error", "Servo angle must be between 60 and 120 degrees")
-        except ValueError:
+            self.serial_connection.write(payload)
+        except Exception as e:
+            self._reset_eot_tracking()
+            self.log_message(f"Send error: {str(e)}")
+            
+    def send_servo_command(self):
+        """Send servo control command based on selected mode, tracking its completion through EOT"""
+        if len(self._eot_backlog) >= MAX_COMMAND_BACKLOG:
+            self._show_busy_hint()
+            return
+            
+        angle_int = self._read_int_var(self.servo_angle_var)
+        if angle_int is None:
             messagebox.showerror("Error", "Invalid servo angle value")
+        elif 60 <= angle_int <= 120:
+            if self.servo_mode_var.get() == "all":
+                # Send to all devices (disk mode)
+                device_id = "000"
+                command = f"{device_id},servo,{angle_int}"
+                payload = self._encode_value_command(device_id, "servo", angle_int)
+                if self.send_command_with_eot_tracking(command, payload):
+                    self.log_message(f"Servo command sent to ALL devices: Angle {angle_int}° (Disk Mode)")
+            else:
+                # Send to individual device
+                device_id = self.servo_device_var.get()
+                command = f"{device_id},servo,{angle_int}"
+                payload = self._encode_value_command(device_id, "servo", angle_int)
+                if self.send_command_with_eot_tracking(command, payload):
+                    self.log_message(f"Servo command sent to Device {device_id}: Angle {angle_int}°")
+        else:
+            messagebox.showerror("Error", "Servo angle must be between 60 and 120 degrees")
             
     def send_dac_command(self):
-        """Send DAC control command based on selected mode with timeout recovery"""
-        if self.waiting_for_eot:
-            messagebox.showwarning("Wait", "Please wait for previous command to complete")
+        """Send DAC control command based on selected mode, tracking its completion through EOT"""
+        if len(self._eot_backlog) >= MAX_COMMAND_BACKLOG:
+            self._show_busy_hint()
             return
             
-        current_ma = self.dac_current_var.get()
-        
-        try:
-            current_int = int(current_ma)
-            if 0 <= current_int <= 1500:
-                # Convert current (mA) to 10-bit DAC value (0-1023)
-                # 0-2100mA maps to 0-1023 raw value
-                dac_value = int((current_int / 2100.0) * 1023)
-                
-                if self.dac_mode_var.get() == "all":
-                    # Send to all devices
-                    device_id = "000"
-                    command = f"{device_id},dac,{dac_value}"
-                    if self.send_command_with_eot_tracking(command):
-                        self.log_message(f"DAC command sent to ALL LEDs: {current_int}mA (Raw: {dac_value})")
-                else:
-                    # Send to individual device
-                    device_id = self.dac_device_var.get()
-                    command = f"{device_id},dac,{dac_value}"
-                    if self.send_command_with_eot_tracking(command):
-                        self.log_message(f"DAC command sent to Device {device_id}: {current_int}mA (Raw: {dac_value})")
-            else:
-                messagebox.showerror("Error", "Current must be between 0 and 1500 mA (safety limit)")
-        except ValueError:
+        current_int = self._read_int_var(self.dac_current_var)
+        if current_int is None:
             messagebox.showerror("Error", "Invalid current value")
+        elif 0 <= current_int <= 1500:
+            # Convert current (mA) to 10-bit DAC value (0-1023)
+            dac_value = _dac_raw_value(current_int)
             
-    def send_command_with_recovery(self, command):
-        """Send command with automatic recovery on timeout"""
-        if not self.connected or not self.serial_connection:
-            messagebox.showerror("Error", "Not connected to device")
-            return False
-        
-        # First, check if Arduino is ready by sending status command
-        self.send_command("status")
-        
-        try:
-            self.serial_connection.write(f"{command}\n".encode())
-            self.log_message(f"TX: {command}")
-            self.command_history.append(command)
-            
-            # Monitor for timeout warning and auto-recover
-            import time
-            start_time = time.time()
-            timeout_detected = False
-            
-            # Check for timeout warning in next few messages
-            while time.time() - start_time < 3.0:  # Wait up to 3 seconds
-                if not self.message_queue.empty():
-                    try:
-                        message_type, data = self.message_queue.get_nowait()
-                        if message_type == 'receive' and "WARNING: Command timeout" in data:
-                            timeout_detected = True
-                            break
-                    except:
-                        pass
-                time.sleep(0.1)
-            
-            if timeout_detected:
-                self.log_message("Timeout detected - reinitializing and retrying...")
-                self.send_command("reinit")
-                time.sleep(2)  # Wait for reinitialization
-                # Retry the command
-                self.serial_connection.write(f"{command}\n".encode())
-                self.log_message(f"TX (retry): {command}")
-                
-            return True
-        except Exception as e:
-            self.log_message(f"Send error: {str(e)}")
-            return False
+            if self.dac_mode_var.get() == "all":
+                # Send to all devices
+                device_id = "000"
+                command = f"{device_id},dac,{dac_value}"
+                payload = self._encode_value_command(device_id, "dac", dac_value)
+                if self.send_command_with_eot_tracking(command, payload):
+                    self.log_message(f"DAC command sent to ALL LEDs: {current_int}mA (Raw: {dac_value})")
+            else:
+                # Send to individual device
+                device_id = self.dac_device_var.get()
+                command = f"{device_id},dac,{dac_value}"
+                payload = self._encode_value_command(device_id, "dac", dac_value)
+                if self.send_command_with_eot_tracking(command, payload):
+                    self.log_message(f"DAC command sent to Device {device_id}: {current_int}mA (Raw: {dac_value})")
+        else:
+            messagebox.showerror("Error", "Current must be between 0 and 1500 mA (safety limit)")
             
-    def send_command_with_eot_tracking(self, command):
-        """Send command and track for completion"""
+    def _show_busy_hint(self):
+        """Flag a refused send inline; a modal dialog would stall the event loop that clears the backlog"""
+        self.status_hint_var.set("⏳ Still processing previous commands")
+        self.root.bell()
+        if self._hint_after_id is not None:
+            self.root.after_cancel(self._hint_after_id)
+        self._hint_after_id = self.root.after(BUSY_HINT_MS, self._clear_busy_hint)
+        
+    def _clear_busy_hint(self):
+        """Remove the busy notice once it has been shown for BUSY_HINT_MS"""
+        self._hint_after_id = None
+        self.status_hint_var.set("")
+        
+    def _encode_value_command(self, device_id, kind, value):
+        """Encode a "<device>,<kind>,<value>" command, reusing the pre-encoded prefix for this target"""
+        key = (device_id, kind)
+        prefix = self._command_prefixes.get(key)
+        if prefix is None:
+            prefix = self._command_prefixes[key] = f"{device_id},{kind},".encode()
+        return prefix + b"%d\n" % value
+        
+    def send_command_with_eot_tracking(self, command, payload=None):
+        """Send command and track for completion (payload: pre-encoded command bytes, optional)"""
         if not self.connected or not self.serial_connection:
             messagebox.showerror("Error", "Not connected to device")
             return False
             
+        # Keep up to MAX_COMMANDS_IN_FLIGHT commands at the firmware, counting untracked sends
+        # that share its receive buffer; later ones wait for an EOT
+        in_flight = self._eot_outstanding + self._untracked_outstanding
+        if self._eot_backlog or in_flight >= MAX_COMMANDS_IN_FLIGHT:
+            self._eot_backlog.append((command, payload))
+            self.log_message(f"⏳ Queued until earlier commands complete: {command}")
+            return True
+        return self._issue_tracked_command(command, payload)
+        
+    def _issue_tracked_command(self, command, payload):
+        """Write a command whose completion is tracked through EOT"""
         try:
             # Log processing message before sending
             self.log_message("⚙️ Processing command")
             
-            self.serial_connection.write(f"{command}\n".encode())
+            self._queue_tx(payload if payload is not None else _encode_command(command))
             self.log_message(f"TX: {command}")
             self.command_history.append(command)
             
-            # Set waiting flag for completion detection
-            self.waiting_for_eot = True
+            # Count the command until its EOT arrives
+            self._eot_outstanding += 1
+            self._arm_eot_timeout()
             self.log_message("⏳ Waiting for command completion...")
             
             return True
         except Exception as e:
             self.log_message(f"Send error: {str(e)}")
-            self.waiting_for_eot = False
+            self._reset_eot_tracking()
             return False
             
+    def _send_backlog(self):
+        """Write held-back commands while there is room for them at the firmware"""
+        while (self._eot_backlog and self.connected
+               and self._eot_outstanding + self._untracked_outstanding < MAX_COMMANDS_IN_FLIGHT):
+            if not self._issue_tracked_command(*self._eot_backlog.popleft()):
+                return
+                
+    def _arm_eot_timeout(self):
+        """Start the lost-EOT timer unless it is already running"""
+        if self._eot_after_id is None:
+            self._eot_after_id = self.root.after(EOT_TIMEOUT_MS, self._on_eot_timeout)
+            
+    def _cancel_eot_timeout(self):
+        """Stop the lost-EOT timer"""
+        if self._eot_after_id is not None:
+            self.root.after_cancel(self._eot_after_id)
+            self._eot_after_id = None
+            
+    def _on_eot_timeout(self):
+        """Give up on EOTs that did not arrive within EOT_TIMEOUT_MS, so sends do not stall forever"""
+        self._eot_after_id = None
+        outstanding = self._eot_outstanding + self._untracked_outstanding
+        dropped = len(self._eot_backlog)
+        self._reset_eot_tracking()
+        message = f"⚠️ No EOT for {outstanding} command(s) within {EOT_TIMEOUT_MS} ms; assuming they were lost"
+        if dropped:
+            message += f", dropped {dropped} queued command(s)"
+        self.log_message(message)
+        
+    def _reset_eot_tracking(self):
+        """Forget commands awaiting EOT, e.g. after a write error, a lost EOT or disconnect"""
+        self._cancel_eot_timeout()
+        self._eot_outstanding = 0
+        self._untracked_outstanding = 0
+        self._eot_backlog.clear()
+            
     def set_servo_angle(self, angle):
         """Set servo angle from preset button"""
         self.servo_angle_var.set(angle)
@@ -842,49 +1561,52 @@ class LEDArrayControllerGUI:
     def set_dac_current(self, current_ma):
         """Set DAC current from preset button"""
         self.dac_current_var.set(current_ma)
+        self.update_dac_raw_value()
         
     def update_dac_raw_value(self, *args):
         """Update raw DAC value display when current changes"""
-        try:
-            current_ma = int(self.dac_current_var.get())
-            # Convert 0-2100mA to 0-1023 raw value (keeping original mapping)
-            # Maximum user input is 1500mA (safety limit) = raw value 730
-            raw_value = int((current_ma / 2100.0) * 1023)
-            self.dac_raw_var.set(str(raw_value))
-        except (ValueError, AttributeError):
-            self.dac_raw_var.set("0")
+        current_ma = self._read_int_var(self.dac_current_var)
+        _set_if_changed(self.dac_raw_var, "0" if current_ma is None else _dac_raw_text(current_ma))
+            
+    def _read_int_var(self, var):
+        """Return the number in an IntVar's entry as an int, or None if it is not a number"""
+        # Read the raw text: IntVar.get() raises TclError for anything that is not a number
+        return _parse_int(str(self.root.getvar(str(var))))
+        
+    def _debounce_scale(self, scale, update):
+        """Coalesce slider drag events: run update with the latest value at most every SCALE_DEBOUNCE_MS"""
+        if update in self._scale_updates_pending:
+            return
+        self._scale_updates_pending.add(update)
+        self.root.after(SCALE_DEBOUNCE_MS, self._run_scale_update, scale, update)
+        
+    def _run_scale_update(self, scale, update):
+        """Apply a debounced slider update using the slider's current position"""
+        self._scale_updates_pending.discard(update)
+        update(scale.get())
             
     def update_servo_display(self, value):
         """Update servo angle display to show integer values"""
-        try:
-            int_value = int(float(value))
-            self.servo_angle_var.set(int_value)
-        except (ValueError, TypeError):
-            pass
+        self.servo_angle_var.set(int(value))
             
     def update_dac_display(self, value):
-        """Update DAC current display to show integer values"""
-        try:
-            int_value = int(float(value))
-            self.dac_current_var.set(int_value)
-        except (ValueError, TypeError):
-            pass
+        """Update DAC current and raw value displays to show integer values"""
+        int_value = int(value)
+        self.dac_current_var.set(int_value)
+        # Update the raw value here rather than through a variable trace: one callback per slider tick
+        _set_if_changed(self.dac_raw_var, _dac_raw_text(int_value))
             
     def export_log(self):
         """Export communication log to file"""
         try:
-            from tkinter import filedialog
-            from datetime import datetime
-            
-            # Get current log content
-            log_content = self.log_text.get(1.0, tk.END)
-            
-            if not log_content.strip():
+            # Export from the in-memory copy of the log; no text is read back out of the widget
+            self._flush_log()
+            if not self._log_lines:
                 messagebox.showwarning("Warning", "Log is empty - nothing to export")
                 return
             
             # Generate default filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
             default_filename = f"led_controller_log_{timestamp}.txt"
             
             # Open file dialog
@@ -900,14 +1622,19 @@ class LEDArrayControllerGUI:
             
             if filename:
                 # Write log content to file
+                header = "\n".join([
+                    "SOLAR- Communication Log",
+                    "=" * 50,
+                    f"Exported: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+                    f"Total Devices: {self.total_devices}",
+                    f"Connection Status: {self.connection_status_var.get()}",
+                    "=" * 50,
+                    "",
+                    "",
+                ])
                 with open(filename, 'w', encoding='utf-8') as f:
-                    f.write("SOLAR- Communication Log\n")
-                    f.write("=" * 50 + "\n")
-                    f.write(f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"Total Devices: {self.total_devices}\n")
-                    f.write(f"Connection Status: {self.connection_status_var.get()}\n")
-                    f.write("=" * 50 + "\n\n")
-                    f.write(log_content)
+                    f.write(header)
+                    f.writelines(self._log_lines)
                 
                 self.log_message(f"Log exported to: {filename}")
                 messagebox.showinfo("Export Complete", f"Log exported successfully to:\n{filename}")
@@ -921,110 +1648,21 @@ class LEDArrayControllerGUI:
     
     def start_dance(self):
         """Start Servo Dance demo: Servo 60→120→90, DAC 50%→0%, repeat 2x"""
-        if self.demo_running:
-            self.log_message("Demo already running - please wait for completion")
-            return
-        if not self.connected:
-            messagebox.showerror("Error", "Not connected to device")
-            return
+        self._start_demo(DANCE_DEMO_STEPS, "Running Servo Dance...",
+                         "🕺 Starting Servo Dance demo...", "🕺 Servo Dance demo completed")
         
-        self.demo_running = True
-        self.demo_status_var.set("Running Servo Dance...")
-        self.disable_demo_buttons()
-        self.demo_thread = threading.Thread(target=self.run_dance, daemon=True)
-        self.demo_thread.start()
-        
-    def run_dance(self):
-        """Run dance pattern"""
-        try:
-            self.log_message("🕺 Starting Servo Dance demo...")
-            
-            for cycle in range(2):  # Repeat 2 times
-                if not self.demo_running:
-                    break
-                    
-                self.log_message(f"Dance - Cycle {cycle + 1}/2")
-                
-                # Servo to 60°
-                self.send_command("000,servo,60")
-                time.sleep(0.8)
-                
-                # Servo to 120°
-                if self.demo_running:
-                    self.send_command("000,servo,120")
-                    time.sleep(0.8)
-                
-                # DAC to 750mA (50% of 1500mA limit)
-                if self.demo_running:
-                    dac_value = int((750 / 2100.0) * 1023)  # 750mA within safety limit
-                    self.send_command(f"000,dac,{dac_value}")
-                    time.sleep(0.5)
-                
-                # Servo to 90°
-                if self.demo_running:
-                    self.send_command("000,servo,90")
-                    time.sleep(0.5)
-                
-                # DAC to 0mA
-                if self.demo_running:
-                    self.send_command("000,dac,0")
-                    time.sleep(0.8)
-                    
-        except Exception as e:
-            self.log_message(f"Demo error: {str(e)}")
-        finally:
-            self.demo_running = False
-            self.root.after(0, self.reset_demo_state)
-            self.log_message("🕺 Servo Dance demo completed")
-    
     def start_servo_wave(self):
         """Start smooth servo wave demo"""
-        if self.demo_running:
-            self.log_message("Demo already running - please wait for completion")
-            return
-        if not self.connected:
-            messagebox.showerror("Error", "Not connected to device")
-            return
-            
-        self.demo_running = True
-        self.demo_status_var.set("Running Servo Wave...")
-        self.disable_demo_buttons()
-        self.demo_thread = threading.Thread(target=self.run_servo_wave, daemon=True)
-        self.demo_thread.start()
+        self._start_demo(SERVO_WAVE_DEMO_STEPS, "Running Servo Wave...",
+                         "🌊 Starting Servo Wave demo...", "🌊 Servo Wave demo completed")
         
-    def run_servo_wave(self):
-        """Run smooth servo wave pattern"""
-        try:
-            self.log_message("🌊 Starting Servo Wave demo...")
-            
-            # Create smooth wave motion
-            for cycle in range(2):
-                if not self.demo_running:
-                    break
-                    
-                # Forward wave: 60 to 120 in small steps
-                for angle in range(60, 121, 5):
-                    if not self.demo_running:
-                        break
-                    self.send_command(f"000,servo,{angle}")
-                    time.sleep(0.3)
-                
-                # Backward wave: 120 to 60 in small steps
-                for angle in range(120, 59, -5):
-                    if not self.demo_running:
-                        break
-                    self.send_command(f"000,servo,{angle}")
-                    time.sleep(0.3)
-                    
-        except Exception as e:
-            self.log_message(f"Demo error: {str(e)}")
-        finally:
-            self.demo_running = False
-            self.root.after(0, self.reset_demo_state)
-            self.log_message("🌊 Servo Wave demo completed")
-    
     def start_dac_rainbow(self):
         """Start DAC rainbow fade demo"""
+        self._start_demo(DAC_RAINBOW_DEMO_STEPS, "Running DAC Rainbow...",
+                         "🌈 Starting DAC Rainbow demo...", "🌈 DAC Rainbow demo completed")
+        
+    def _start_demo(self, steps, status, start_message, done_message):
+        """Run steps one at a time from the Tk event loop, pausing between them with root.after"""
         if self.demo_running:
             self.log_message("Demo already running - please wait for completion")
             return
@@ -1033,59 +1671,60 @@ class LEDArrayControllerGUI:
             return
             
         self.demo_running = True
-        self.demo_status_var.set("Running DAC Rainbow...")
+        self.demo_status_var.set(status)
         self.disable_demo_buttons()
-        self.demo_thread = threading.Thread(target=self.run_dac_rainbow, daemon=True)
-        self.demo_thread.start()
-        
-    def run_dac_rainbow(self):
-        """Run DAC rainbow fade pattern"""
-        try:
-            self.log_message("🌈 Starting DAC Rainbow demo...")
+        self._demo_steps = steps
+        self._demo_index = 0
+        self._demo_deadline = time.monotonic()
+        self._demo_done_message = done_message
+        self.log_message(start_message)
+        self._demo_step()
+        
+    def _demo_step(self):
+        """Send the next demo command and schedule the one after it"""
+        self._demo_after_id = None
+        if not self.demo_running:
+            return
+        if self._demo_index >= len(self._demo_steps):
+            self._finish_demo()
+            return
+        if not self.connected:
+            self.log_message("Demo error: connection lost")
+            self._finish_demo()
+            return
             
-            for cycle in range(2):  # 2 complete fades
-                if not self.demo_running:
-                    break
-                    
-                # Fade up: 0mA to 1500mA (safety limit)
-                for current_ma in range(0, 1501, 150):
-                    if not self.demo_running:
-                        break
-                    dac_value = int((current_ma / 2100.0) * 1023)
-                    self.send_command(f"000,dac,{dac_value}")
-                    time.sleep(0.2)
-                
-                # Hold at maximum
-                if self.demo_running:
-                    time.sleep(0.5)
-                
-                # Fade down: 1500mA to 0mA
-                for current_ma in range(1500, -1, -150):
-                    if not self.demo_running:
-                        break
-                    dac_value = int((current_ma / 2100.0) * 1023)
-                    self.send_command(f"000,dac,{dac_value}")
-                    time.sleep(0.2)
-                
-                # Hold at minimum
-                if self.demo_running:
-                    time.sleep(0.5)
-                    
-        except Exception as e:
-            self.log_message(f"Demo error: {str(e)}")
-        finally:
-            self.demo_running = False
-            self.root.after(0, self.reset_demo_state)
-            self.log_message("🌈 DAC Rainbow demo completed")
-    
-
+        command, delay_ms, note = self._demo_steps[self._demo_index]
+        self._demo_index += 1
+        if note:
+            self.log_message(note)
+        if command:
+            self.send_command(command)
+        # Pace from a running deadline rather than from now, so the time spent sending and
+        # any late timer firing don't accumulate as drift over the demo
+        now = time.monotonic()
+        delay = delay_ms / 1000
+        if self._demo_deadline < now - delay:
+            # More than a step behind after a stall (window drag, modal dialog): resync to now
+            # instead of firing the overdue steps back to back and flooding the Arduino's RX buffer
+            self._demo_deadline = now
+        self._demo_deadline += delay
+        remaining_ms = max(0, round((self._demo_deadline - now) * 1000))
+        self._demo_after_id = self.root.after(remaining_ms, self._demo_step)
+        
+    def _finish_demo(self):
+        """End the current demo and restore the demo controls"""
+        self.demo_running = False
+        if self._demo_after_id is not None:
+            self.root.after_cancel(self._demo_after_id)
+            self._demo_after_id = None
+        self.reset_demo_state()
+        self.log_message(self._demo_done_message)
     
     def stop_demo(self):
         """Stop any running demo"""
         if self.demo_running:
-            self.demo_running = False
             self.log_message("⏹️ Demo stopped by user")
-            self.reset_demo_state()
+            self._finish_demo()
         
     def disable_demo_buttons(self):
         """Disable all demo buttons during demo"""
@@ -1110,6 +1749,12 @@ class LEDArrayControllerGUI:
 
     def show_help_window(self):
         """Show comprehensive GUI help window"""
+        # The window is built once and hidden on close; later clicks just bring it back
+        if self._help_window is not None and self._help_window.winfo_exists():
+            self._help_window.deiconify()
+            self._help_window.lift()
+            return
+            
         help_window = tk.Toplevel(self.root)
         help_window.title("SOLAR- Help")
         help_window.geometry("800x600")
@@ -1122,228 +1767,129 @@ class LEDArrayControllerGUI:
         help_text = scrolledtext.ScrolledText(help_frame, height=30, width=80, wrap=tk.WORD)
         help_text.pack(fill=tk.BOTH, expand=True)
         
-        # Help content
-        help_content = """
-        SOLAR GUI - Complete User Guide
-        ========================================================
-        
-        🚀 WHAT THIS SYSTEM DOES:
-        
-        This GUI controls a smart chain of SEEEDuino XIAO controllers that can:
-        • Control LED brightness on multiple devices simultaneously or individually
-        • Move servo motors to precise positions (60-120 degrees)  
-        • Communicate through a daisy-chain setup (like Christmas lights, but smarter!)
-        • Automatically detect how many devices are connected
-        • Provide visual feedback when something goes wrong
-        
-        Think of it as a "conductor" for an orchestra of LED arrays and servo motors!
-        
-        📍 HARDWARE SETUP:
-        
-        Pin Connections (on each XIAO board):
-        • A0 = DAC Output → LED Array Control (amplified)
-        • D2 = PWM Output → Servo Motor (5V logic level)
-        • D1 = RX_READY ← Signal from previous device
-        • D3 = TX_READY → Signal to next device
-        • D6 = TX → Data to next device
-        • D7 = RX ← Data from previous device
-        • D10 = User LED (built-in status indicator)
-        
-        Chain Configuration:
-        [Master Device] → [Device 2] → [Device 3] → ... → [Back to Master]
-            (USB)           (12V)        (12V)
-        
-        🎯 DEVICE NUMBERING SYSTEM:
-        
-        • 000 = ALL DEVICES (Broadcast to entire chain)
-        • 001 = Master Device (Connected to computer via USB)
-        • 002, 003, 004... = Slave Devices (Powered externally, in daisy-chain)
-        
-        🎮 GUI CONTROL SECTIONS:
-        
-        1. SERIAL CONNECTION:
-           • Port Selection: Choose your USB COM port
-           • Baud Rate: Set to 115200 (matches Arduino)
-           • Auto-Connect: Automatically connects to first available port
-           • Refresh: Scan for new ports
-        
-        2. SYSTEM STATUS:
-           • Connection Status: Green=Connected, Red=Disconnected
-           • Total Devices: Auto-detected device count in chain
-           • System State: Ready, Initializing, Processing, etc.
-           • Manual Commands: Device Status, Re-initialize, Help
-        
-        3. DEMO PATTERNS:
-           • 🕺 Simple Dance: Servo sweep + DAC flash (2 cycles)
-           • 🌊 Servo Wave: Smooth servo oscillation (2 cycles)
-           • 🌈 DAC Rainbow: Progressive brightness fade (2 cycles)
-           • ⏹️ Stop Demo: Interrupt any running demo
-        
-        4. SERVO CONTROL:
-           • Range: 60-120 degrees (safety limited)
-           • All Servos Mode: Synchronize all devices (Disk Mode)
-           • Individual Mode: Target specific device (001, 002, etc.)
-           • Presets: 60°, 75°, 90°, 105°, 120°
-           • Real-time Slider: Live angle adjustment
-        
-        5. DAC/LED CONTROL:
-           • Range: 0-1500mA (safety limited, converts to 0-730 raw)
-           • All LEDs Mode: Broadcast to entire chain
-           • Individual Mode: Target specific device
-           • Presets: 0mA, 375mA, 750mA, 1125mA, 1500mA
-           • Raw Value Display: Shows actual DAC value sent
-        
-        6. COMMUNICATION LOG:
-           • TX: Commands sent from GUI to Arduino
-           • RX: Responses received from Arduino (filtered)
-           • Timestamps: All communications timestamped
-           • Export/Clear: Save logs or clear display
-        
-        🎯 COMMAND EXAMPLES:
-        
-        Servo Commands (GUI generates these automatically):
-        • All servos to 90°: "000,servo,90"
-        • Device 2 servo to 75°: "002,servo,75"
-        • Device 1 servo to 120°: "001,servo,120"
-        
-        DAC/LED Commands (current in mA, max 1500mA):
-        • All LEDs to 750mA: "000,dac,365" (50% of limit)
-        • Device 3 LED to 1125mA: "003,dac,548" (75% of limit)
-        • Turn off device 1 LEDs: "001,dac,0" (0mA)
-        
-        System Commands:
-        • "status" - Check device count and system state
-        • "reinit" - Restart device chain detection
-        
-        🔧 CONNECTION PROCESS:
-        
-        1. Hardware Setup:
-           • Connect master device to computer via USB
-           • Connect 12V power to all slave devices
-           • Verify daisy-chain wiring is correct
-        
-        2. Software Connection:
-           • Launch GUI (auto-connects to first port)
-           • Or manually select COM port and click "Connect"
-           • Wait 5-10 seconds for device initialization
-           • Check "Total Devices" shows correct count
-        
-        3. Test System:
-           • Click "Device Status" to verify all devices
-           • Try a simple servo command (e.g., All Servos to 90°)
-           • Watch for "✓ Command completed successfully"
-        
-        🚨 TROUBLESHOOTING:
-        
-        Visual Indicators on Hardware:
-        • Blue LED Stuck On: Device error - press reset button on PCB
-        • Orange LED Blinking: Normal state indication
-        • User LED Active: When DAC output > 0
-        
-        Common Issues:
-        
-        Device Detection Problems:
-        • Symptom: "Total Devices" shows 0 or wrong count
-        • Solution: Click "Re-initialize" to restart detection
-        • Check: Verify all devices are powered and connected
-        • Verify: Physical daisy-chain connections are correct
-        
-        Command Not Working:
-        • Check: Device count matches your hardware
-        • Verify: Servo angles are within 60-120°
-        • Verify: DAC current is within 0-1500mA (safety limit)
-        • Check: Communication log for error messages
-        • Try: "Device Status" to check system health
-        
-        Chain Communication Failure:
-        • Symptom: Commands timeout or devices don't respond
-        • Solution: Press reset button on any stuck device (blue LED on)
-        • Check: All power connections and daisy-chain wiring
-        • Try: Disconnect/reconnect USB and restart GUI
-        
-        Wrong Device Count:
-        • Symptom: GUI shows wrong number of devices
-        • Solution: Click "Re-initialize" in System Status
-        • Check: Power all devices before connecting USB
-        • Verify: No broken connections in the chain
-        
-        🎯 BEST PRACTICES:
-        
-        1. Startup Sequence:
-           • Power all slave devices with 12V first
-           • Then connect master device USB to computer
-           • Launch GUI and wait for initialization
-        
-        2. Operation:
-           • Always wait for "✓ Command completed successfully"
-           • Use "All" modes for synchronized movements
-           • Use "Individual" modes for precise control
-           • Monitor communication log for issues
-        
-        3. Demos:
-           • Demos run for 2 complete cycles automatically
-           • Use "Stop Demo" to interrupt any demo
-           • Demos sync with current system state
-           • Perfect for testing your complete setup
-        
-        4. Troubleshooting:
-           • Export logs before reporting issues
-           • Check hardware connections first
-           • Use "Re-initialize" for detection problems
-           • Reset devices (button) if LEDs stuck on
-        
-        💡 TECHNICAL SPECIFICATIONS:
-        
-        • Microcontroller: SAMD21 (SEEEDuino XIAO)
-        • Communication: 115200 baud, round-robin protocol
-        • Servo Range: 60-120 degrees (safety limited)
-        • DAC Range: 0-1500mA (safety limited, mapped to 0-730 raw values)
-        • Max Chain Length: Limited by power and timing
-        • Auto-Discovery: Automatic device detection
-        • Error Recovery: Automatic timeout handling
-        
-        For advanced users: The Arduino code includes extensive
-        error checking and self-recovery features. Check the
-        communication log for detailed system messages.
-        
-        """
-        
-        help_text.insert(tk.END, help_content)
+        help_text.insert(tk.END, HELP_TEXT)
         help_text.configure(state='disabled')  # Make read-only
         
         # Close button
         close_btn = ttk.Button(help_frame, text="Close", 
-                              command=help_window.destroy)
+                              command=help_window.withdraw)
         close_btn.pack(pady=(10, 0))
+        help_window.protocol("WM_DELETE_WINDOW", help_window.withdraw)
+        
+        self._help_window = help_window
             
     def log_message(self, message):
         """Add message to log with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}\n"
-        
-        # Update GUI in main thread
-        self.root.after(0, self._append_to_log, formatted_message)
+        if threading.get_ident() != self._main_thread_id:
+            # Never touch Tk from worker threads (port scan, serial reader)
+            self.log_from_thread(message)
+            return
+            
+        self._buffer_log_line(self._format_log_line(message))
+        
+    def log_from_thread(self, message):
+        """Queue a log message from a worker thread; update_gui writes it in the main thread"""
+        self.post_message('log', self._format_log_line(message))
+        
+    def _buffer_log_line(self, formatted_message):
+        """Buffer a formatted line; the widget is updated once per Tk idle tick (main thread only)"""
+        self._log_pending.append(formatted_message)
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.root.after_idle(self._flush_log)
+        
+    def _flush_log(self):
+        """Write all buffered log lines to the log widget (must be called from main thread)"""
+        pending = self._log_pending
+        self._log_pending = []
+        self._log_flush_scheduled = False
+            
+        if not pending:
+            return
+            
+        # Status replies often repeat the same UI:/STATE: line; show each run once with a count
+        runs = _repeat_runs(pending)
+        tail = self._log_tail
+        if tail is not None and runs[0][1] == tail[1]:
+            # The run at the end of the log continues; bump its count in place
+            tail[2] += runs.pop(0)[2]
+            self._replace_last_log_line(_repeat_line(tail))
+        if not runs:
+            return
+            
+        self._log_tail = runs[-1]
+        lines = [_repeat_line(run) for run in runs]
+        if len(lines) > LOG_MAX_LINES:
+            # A burst larger than the log would be trimmed straight away; only keep what survives
+            del lines[:-LOG_MAX_LINES]
+        self._log_lines.extend(lines)
+        self._append_to_log("".join(lines))
+            
+    def _replace_last_log_line(self, line):
+        """Rewrite the last line of the log widget and history (must be called from main thread)"""
+        self._log_lines[-1] = line
+        follow = self._log_at_bottom()
+        self.log_text.delete("end-1c -1l linestart", "end-1c")
+        self.log_text.insert(tk.END, line)
+        if follow:
+            self.log_text.see(tk.END)
+        
+    def _format_log_line(self, message):
+        """Return message as a timestamped log line"""
+        now_ms = int(time.time() * 1000)
+        cached_ms, prefix = self._ts_prefix
+        if now_ms != cached_ms:
+            # Lines logged within the same millisecond share one prefix string, and
+            # strftime only runs once per second
+            sec, ms = divmod(now_ms, 1000)
+            cached_sec, clock = self._ts_clock
+            if sec != cached_sec:
+                clock = time.strftime("%H:%M:%S", time.localtime(sec))
+                self._ts_clock = (sec, clock)
+            prefix = f"[{clock}.{ms:03d}] "
+            self._ts_prefix = (now_ms, prefix)
+        return prefix + message + "\n"
         
     def _append_to_log(self, message):
         """Append message to log text widget (must be called from main thread)"""
+        follow = self._log_at_bottom()
         self.log_text.insert(tk.END, message)
-        self.log_text.see(tk.END)
-        
-        # Limit log size
-        lines = self.log_text.get(1.0, tk.END).count('\n')
-        if lines > 1000:
-            self.log_text.delete(1.0, "100.0")
+        if follow:
+            self.log_text.see(tk.END)
+        
+        # Limit log size: let it overshoot by LOG_TRIM_SLACK lines, then cut back to
+        # LOG_MAX_LINES in one delete so trimming is rare and amortized
+        self._log_line_count += message.count("\n")
+        if self._log_line_count > LOG_MAX_LINES + LOG_TRIM_SLACK:
+            excess = self._log_line_count - LOG_MAX_LINES
+            self.log_text.delete(1.0, f"{excess + 1}.0")
+            self._log_line_count = LOG_MAX_LINES
+            while len(self._log_lines) > LOG_MAX_LINES:
+                self._log_lines.popleft()
             
+    def _log_at_bottom(self):
+        """True if the end of the log is in view; new output is only scrolled to while it is"""
+        return self.log_text.yview()[1] >= 1.0
+        
     def clear_log(self):
         """Clear the communication log"""
+        self._log_lines.clear()
         self.log_text.delete(1.0, tk.END)
+        self._log_line_count = 0
+        self._log_tail = None
         self.log_message("Log cleared")
         
     def on_closing(self):
         """Handle application closing"""
+        self._closing = True
+        
+        # Cancel pending timers so none of them fires against the destroyed window
+        for after_id in (self._demo_after_id, self._hint_after_id, self._eot_after_id):
+            if after_id is not None:
+                self.root.after_cancel(after_id)
+                
         if self.connected:
             self.disconnect_serial()
-        self.stop_threads = True
         self.root.destroy()
 
 
@@ -0,0 +1,116 @@
+"""Shared fixtures: build the GUI object without a display, with fakes for the Tk widgets it touches"""
+
+import collections
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import led_array_controller_gui as gui_module
+
+
+class FakeLogText:
+    """Stands in for the log ScrolledText: keeps its content as one string"""
+    
+    def __init__(self):
+        self.text = ""
+        
+    def insert(self, index, text):
+        assert index == "end"
+        self.text += text
+        
+    def delete(self, start, end):
+        lines = self.text.splitlines(True)
+        if start == "end-1c -1l linestart":
+            del lines[-1:]
+        elif end == "end":
+            lines = []
+        else:
+            # "1.0" .. "N.0" removes the first N-1 lines
+            del lines[:int(str(end).split(".")[0]) - 1]
+        self.text = "".join(lines)
+        
+    def see(self, index):
+        pass
+        
+    def yview(self):
+        return (0.0, 1.0)
+        
+    def lines(self):
+        return self.text.splitlines(True)
+
+
+class FakeRoot:
+    """Stands in for the Tk root: records timers instead of running them"""
+    
+    def __init__(self):
+        self.timers = {}
+        self.idle = []
+        self._next_id = 0
+        
+    def after(self, ms, func, *args):
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.timers[after_id] = (ms, func, args)
+        return after_id
+        
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+        
+    def after_idle(self, func, *args):
+        self.idle.append((func, args))
+        
+    def fire(self, after_id):
+        """Run a pending timer as the event loop would"""
+        _, func, args = self.timers.pop(after_id)
+        func(*args)
+
+
+class FakeSerial:
+    """Stands in for an open serial.Serial: collects everything written"""
+    
+    is_open = True
+    
+    def __init__(self):
+        self.written = bytearray()
+        
+    def write(self, data):
+        self.written += data
+        return len(data)
+
+
+@pytest.fixture
+def gui():
+    """A GUI instance with only the log state set up, as __init__ would leave it"""
+    app = gui_module.LEDArrayControllerGUI.__new__(gui_module.LEDArrayControllerGUI)
+    app.log_text = FakeLogText()
+    app._log_lines = collections.deque(maxlen=gui_module.LOG_MAX_LINES + gui_module.LOG_TRIM_SLACK)
+    app._log_pending = []
+    app._log_flush_scheduled = False
+    app._log_line_count = 0
+    app._log_tail = None
+    app._ts_clock = (0, "")
+    app._ts_prefix = (0, "")
+    return app
+
+
+@pytest.fixture
+def connected_gui(gui):
+    """The log-only GUI, connected to a fake port with the command send state set up"""
+    gui.root = FakeRoot()
+    gui._main_thread_id = threading.get_ident()
+    gui.connected = True
+    gui.serial_connection = FakeSerial()
+    gui.command_history = collections.deque(maxlen=gui_module.COMMAND_HISTORY_SIZE)
+    gui._last_feedback = None
+    gui._tx_buf = bytearray()
+    gui._tx_scheduled = False
+    gui._tx_lock = threading.Lock()
+    gui._eot_outstanding = 0
+    gui._eot_backlog = collections.deque()
+    gui._untracked_outstanding = 0
+    gui._eot_after_id = None
+    return gui
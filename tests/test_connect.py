@@ -0,0 +1,107 @@
+"""Opening the serial port"""
+
+import led_array_controller_gui as gui_module
+
+
+class FakeVar:
+    def __init__(self, value):
+        self.value = value
+        
+    def get(self):
+        return self.value
+
+
+class FakePort:
+    """A port that opens fine but refuses driver tuning"""
+    
+    def __init__(self, **kwargs):
+        self.is_open = True
+        
+    def set_buffer_size(self, rx_size):
+        raise OSError("set_buffer_size failed")
+        
+    def close(self):
+        self.is_open = False
+
+
+def test_port_is_closed_when_setup_fails(connected_gui, monkeypatch):
+    """A port that opened but failed setup is released instead of being held open"""
+    gui = connected_gui
+    gui.connected = False
+    gui.serial_connection = None
+    gui.port_var = FakeVar("COM3")
+    gui.baud_var = FakeVar("115200")
+    errors = []
+    monkeypatch.setattr(gui_module.serial, "Serial", FakePort)
+    monkeypatch.setattr(gui_module.messagebox, "showerror", lambda title, message: errors.append(message))
+    
+    gui.connect_serial()
+    
+    assert not gui.connected
+    assert not gui.serial_connection.is_open
+    assert errors == ["Failed to connect: set_buffer_size failed"]
+
+
+def _auto_connect_gui(gui, saved_port, openable):
+    """Set gui up for auto-connect, with connect_serial replaced by one that opens only `openable`"""
+    gui.port_var = FakeVar(saved_port)
+    gui.port_var.set = lambda value: setattr(gui.port_var, "value", value)
+    gui.connected = False
+    gui.available_ports = []
+    gui._port_scan_running = False
+    gui.update_port_list = lambda: None
+    attempts = []
+    
+    def connect_serial(show_errors=True):
+        attempts.append((gui.port_var.get(), show_errors))
+        gui.connected = gui.port_var.get() in openable
+        
+    gui.connect_serial = connect_serial
+    return attempts
+
+
+def test_saved_port_opens_without_waiting_for_the_scan(connected_gui):
+    """The last used port is opened straight away, before any port scan has finished"""
+    gui = connected_gui
+    attempts = _auto_connect_gui(gui, "COM3", openable={"COM3"})
+    gui._port_scan_running = True
+    
+    gui.auto_connect_last_port()
+    
+    assert attempts == [("COM3", False)]
+    assert gui.connected
+    assert not gui.root.timers
+
+
+def test_missing_saved_port_falls_back_to_the_first_port_found(connected_gui):
+    """When the saved port cannot be opened, the first scanned port is selected and connected"""
+    gui = connected_gui
+    attempts = _auto_connect_gui(gui, "COM3", openable={"COM5"})
+    gui._port_scan_running = True
+    
+    gui.auto_connect_last_port()
+    assert attempts == [("COM3", False)]
+    (after_id, _), = gui.root.timers.items()
+    
+    # The scan finishes: the gone port is replaced in the dropdown, then the retry connects
+    gui.port_combo = {}
+    gui._ports_cache = (0.0, None)
+    gui._on_ports(("COM5", "COM7"))
+    assert gui.port_var.get() == "COM5"
+    gui.root.fire(after_id)
+    
+    assert attempts == [("COM3", False), ("COM5", True)]
+    assert gui.connected
+
+
+def test_scan_clears_a_gone_port_when_none_are_left(connected_gui):
+    """With no ports present, the saved port name does not stay in the dropdown"""
+    gui = connected_gui
+    _auto_connect_gui(gui, "COM3", openable=set())
+    gui.port_combo = {}
+    gui._ports_cache = (0.0, None)
+    
+    gui._on_ports(())
+    
+    assert gui.port_var.get() == ""
+    assert gui.port_combo['values'] == []
@@ -0,0 +1,86 @@
+"""Pipelining of EOT-tracked commands"""
+
+from led_array_controller_gui import EOT_TIMEOUT_MS, MAX_COMMANDS_IN_FLIGHT
+
+
+def _eot(gui):
+    gui._on_command_complete(None)
+
+
+def test_untracked_sends_count_towards_the_in_flight_cap(connected_gui):
+    """Plain sends share the firmware buffer, so they hold tracked commands back"""
+    gui = connected_gui
+    gui.send_command("status")
+    for i in range(MAX_COMMANDS_IN_FLIGHT):
+        gui.send_command_with_eot_tracking(f"000,servo,{60 + i}")
+        
+    assert gui._untracked_outstanding == 1
+    assert gui._eot_outstanding == MAX_COMMANDS_IN_FLIGHT - 1
+    assert [command for command, _ in gui._eot_backlog] == [f"000,servo,{60 + MAX_COMMANDS_IN_FLIGHT - 1}"]
+
+
+def test_eot_for_untracked_send_releases_a_held_back_command(connected_gui):
+    """Any EOT frees a slot at the firmware, and the oldest held-back command takes it"""
+    gui = connected_gui
+    gui.send_command("status")
+    for i in range(MAX_COMMANDS_IN_FLIGHT + 1):
+        gui.send_command_with_eot_tracking(f"000,servo,{60 + i}")
+    _eot(gui)
+    
+    assert gui._untracked_outstanding == 0
+    assert gui._eot_outstanding == MAX_COMMANDS_IN_FLIGHT
+    assert [command for command, _ in gui._eot_backlog] == [f"000,servo,{60 + MAX_COMMANDS_IN_FLIGHT}"]
+
+
+def test_in_flight_never_exceeds_the_cap(connected_gui):
+    """Mixed plain and tracked sends never put more than the cap at the firmware through tracked sends"""
+    gui = connected_gui
+    for i in range(10):
+        gui.send_command_with_eot_tracking(f"000,dac,{i}")
+        if i % 3 == 0:
+            _eot(gui)
+        assert gui._eot_outstanding + gui._untracked_outstanding <= MAX_COMMANDS_IN_FLIGHT
+
+
+def test_lost_eot_times_out_and_unblocks_sends(connected_gui):
+    """When an EOT never arrives, the timer clears the counts and the backlog"""
+    gui = connected_gui
+    gui.send_command("reinit")
+    for i in range(MAX_COMMANDS_IN_FLIGHT + 2):
+        gui.send_command_with_eot_tracking(f"000,servo,{60 + i}")
+    (after_id, (ms, _, _)), = gui.root.timers.items()
+    assert ms == EOT_TIMEOUT_MS
+    
+    gui.root.fire(after_id)
+    assert gui._eot_outstanding == 0
+    assert gui._untracked_outstanding == 0
+    assert not gui._eot_backlog
+    assert gui._eot_after_id is None
+    
+    gui.send_command_with_eot_tracking("000,servo,90")
+    assert gui._eot_outstanding == 1
+
+
+def test_timer_stops_once_every_eot_has_arrived(connected_gui):
+    """No timer is left running when nothing awaits an EOT"""
+    gui = connected_gui
+    gui.send_command("status")
+    gui.send_command_with_eot_tracking("000,servo,90")
+    _eot(gui)
+    assert gui._eot_after_id is not None
+    _eot(gui)
+    
+    assert gui._eot_after_id is None
+    assert not gui.root.timers
+
+
+def test_reset_clears_counts_backlog_and_timer(connected_gui):
+    """Disconnecting (or a write error) forgets everything awaiting EOT"""
+    gui = connected_gui
+    gui.send_command("status")
+    for i in range(MAX_COMMANDS_IN_FLIGHT + 1):
+        gui.send_command_with_eot_tracking(f"000,servo,{60 + i}")
+    gui._reset_eot_tracking()
+    
+    assert (gui._eot_outstanding, gui._untracked_outstanding, len(gui._eot_backlog)) == (0, 0, 0)
+    assert not gui.root.timers
@@ -0,0 +1,57 @@
+"""Communication log batching and trimming"""
+
+from led_array_controller_gui import LOG_MAX_LINES, LOG_TRIM_SLACK
+
+
+def _lines(count, start=0):
+    return [f"[10:00:00.000] line {i}\n" for i in range(start, start + count)]
+
+
+def _flush(gui, lines):
+    gui._log_pending = list(lines)
+    gui._flush_log()
+
+
+def test_burst_on_top_of_existing_lines(gui):
+    """A burst larger than the log adds only its last LOG_MAX_LINES lines, once, in widget and history"""
+    earlier = _lines(20)
+    _flush(gui, earlier)
+    burst = _lines(LOG_MAX_LINES + 50, start=20)
+    _flush(gui, burst)
+    
+    shown = gui.log_text.lines()
+    assert shown == earlier + burst[-LOG_MAX_LINES:]
+    assert list(gui._log_lines) == shown
+    assert gui._log_line_count == len(shown)
+
+
+def test_burst_keeps_older_lines_that_still_fit(gui):
+    """Lines already shown stay while the log has room for them next to the burst's tail"""
+    _flush(gui, _lines(LOG_TRIM_SLACK))
+    _flush(gui, _lines(LOG_MAX_LINES + 1, start=LOG_TRIM_SLACK))
+    
+    shown = gui.log_text.lines()
+    assert len(shown) == LOG_MAX_LINES + LOG_TRIM_SLACK
+    assert list(gui._log_lines) == shown
+    assert gui._log_line_count == len(shown)
+
+
+def test_trim_keeps_export_history_in_step(gui):
+    """Trimming the widget trims the export history to the same lines"""
+    for start in range(0, 3 * LOG_MAX_LINES, 100):
+        _flush(gui, _lines(100, start=start))
+        shown = gui.log_text.lines()
+        assert list(gui._log_lines) == shown
+        assert gui._log_line_count == len(shown)
+        assert len(shown) <= LOG_MAX_LINES + LOG_TRIM_SLACK
+
+
+def test_repeated_lines_collapse_into_one_counted_line(gui):
+    """A run of identical messages shows once, with its count updated across flushes"""
+    _flush(gui, ["[10:00:00.001] STATE: Ready\n", "[10:00:00.002] STATE: Ready\n"])
+    _flush(gui, ["[10:00:00.003] STATE: Ready\n"])
+    
+    shown = gui.log_text.lines()
+    assert len(shown) == 1
+    assert "(x3)" in shown[0]
+    assert list(gui._log_lines) == shown
@@ -0,0 +1,24 @@
+"""Parsing of the numbers typed into the servo and DAC entries"""
+
+import pytest
+
+from led_array_controller_gui import _parse_int
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("90", 90),
+    (" 1500 ", 1500),
+    ("-5", -5),
+    ("87.34", 87),
+    ("90.0", 90),
+    ("-0.5", 0),
+])
+def test_numbers_truncate_like_intvar(text, expected):
+    """Whole and decimal values parse, decimals truncated toward zero as IntVar.get() does"""
+    assert _parse_int(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "abc", "12abc", "1.2.3", "inf", "nan"])
+def test_garbage_is_rejected(text):
+    """Text that is not a number gives None, so the caller can show its error dialog"""
+    assert _parse_int(text) is None